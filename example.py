@@ -46,6 +46,7 @@ def main():
         # 插入文档
         print("\n5. 插入文档到Milvus...")
         client.insert_documents(documents, embeddings)
+        client.flush()
         
         # 显示统计信息
         stats = client.get_collection_stats()
@@ -59,13 +60,15 @@ def main():
             "Python用于什么？"
         ]
         
-        for query in queries:
+        # 一次性批量向量化所有查询，并在一次 RPC 中完成全部检索
+        query_embeddings = vectorizer.encode(queries)
+        batches = client.search_batch(query_embeddings, top_k=3)
+
+        for query, batch in zip(queries, batches):
             print(f"\n   查询: '{query}'")
-            query_embedding = vectorizer.encode([query])[0]
-            results = client.search(query_embedding, top_k=3)
             
-            for i, result in enumerate(results, 1):
-                print(f"   {i}. [相似度: {result['score']:.4f}] {result['text']}")
+            for i, (score, text) in enumerate(zip(batch.scores, batch.texts), 1):
+                print(f"   {i}. [相似度: {score:.4f}] {text}")
         
         print("\n" + "=" * 60)
         print("示例运行完成！")
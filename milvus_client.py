@@ -2,6 +2,8 @@
 Milvus客户端模块
 用于连接Milvus数据库并管理集合
 """
+import logging
+
 from pymilvus import (
     connections,
     Collection,
@@ -10,9 +12,22 @@ from pymilvus import (
     DataType,
     utility
 )
-from typing import List, Optional
+from typing import List, Optional, Union
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+# 索引与检索参数是常量，模块加载时构建一次
+_INDEX_PARAMS = {
+    "metric_type": "L2",
+    "index_type": "IVF_FLAT",
+    "params": {"nlist": 128}
+}
+_SEARCH_PARAMS = {"metric_type": "L2", "params": {"nprobe": 10}}
+
+# 单条 "id in [...]" 表达式最多携带的主键数，超出时分批请求，限制表达式长度与服务端解析开销
+_IN_EXPR_CHUNK = 1000
+
 
 class MilvusClient:
     """Milvus客户端封装类"""
@@ -29,6 +44,12 @@ class MilvusClient:
         self.port = port
         self.connection_name = "default"
         self.collection_name = "document_collection"
+        # 已 load 过的集合名，避免每次读操作都重复发起 load RPC
+        self._loaded = set()
+        # 缓存的 Collection 句柄（构造 Collection 会向服务端 describe 集合）
+        self._collection: Optional[Collection] = None
+        # 是否已 connect，is_connected 直接读取
+        self._connected = False
         
     def connect(self):
         """连接到Milvus服务器"""
@@ -38,18 +59,20 @@ class MilvusClient:
                 host=self.host,
                 port=self.port
             )
-            print(f"✓ 成功连接到Milvus服务器 ({self.host}:{self.port})")
+            self._connected = True
+            logger.info("成功连接到Milvus服务器 (%s:%s)", self.host, self.port)
         except Exception as e:
-            print(f"✗ 连接Milvus失败: {e}")
+            logger.error("连接Milvus失败: %s", e)
             raise
     
     def disconnect(self):
         """断开Milvus连接"""
+        self._connected = False
         try:
             connections.disconnect(self.connection_name)
-            print("✓ 已断开Milvus连接")
+            logger.info("已断开Milvus连接")
         except Exception as e:
-            print(f"✗ 断开连接失败: {e}")
+            logger.error("断开连接失败: %s", e)
     
     def create_collection(self, dimension: int = 384, collection_name: Optional[str] = None):
         """
@@ -64,8 +87,8 @@ class MilvusClient:
         
         # 检查集合是否已存在
         if utility.has_collection(self.collection_name):
-            print(f"集合 '{self.collection_name}' 已存在")
-            return Collection(self.collection_name)
+            logger.info("集合 '%s' 已存在", self.collection_name)
+            return self.get_collection()
         
         # 定义字段
         fields = [
@@ -81,48 +104,60 @@ class MilvusClient:
         collection = Collection(self.collection_name, schema)
         
         # 创建索引
-        index_params = {
-            "metric_type": "L2",
-            "index_type": "IVF_FLAT",
-            "params": {"nlist": 128}
-        }
-        collection.create_index("embedding", index_params)
+        collection.create_index("embedding", _INDEX_PARAMS)
+        self._collection = collection
         
-        print(f"✓ 成功创建集合 '{self.collection_name}'")
+        logger.info("成功创建集合 '%s'", self.collection_name)
         return collection
     
     def get_collection(self) -> Collection:
-        """获取集合对象"""
+        """获取集合对象（句柄按集合名缓存，只有首次访问才检查集合是否存在）"""
+        cached = self._collection
+        if cached is not None and cached.name == self.collection_name:
+            return cached
         if not utility.has_collection(self.collection_name):
             raise ValueError(f"集合 '{self.collection_name}' 不存在，请先创建集合")
-        return Collection(self.collection_name)
+        self._collection = Collection(self.collection_name)
+        return self._collection
+    
+    def _ensure_loaded(self, collection: Collection):
+        """确保集合已加载到内存，每个集合只发起一次 load RPC"""
+        if collection.name not in self._loaded:
+            collection.load()
+            self._loaded.add(collection.name)
     
-    def insert_documents(self, texts: List[str], embeddings: List[List[float]]):
+    def insert_documents(self, texts: List[str], embeddings: Union[List[List[float]], np.ndarray], flush: bool = False):
         """
         插入文档和向量
         
         Args:
             texts: 文档文本列表
-            embeddings: 对应的向量列表
+            embeddings: 对应的向量列表或 (N, dim) 数组，统一转为连续的 float32 矩阵后再插入
+            flush: 是否立即 flush（seal segment，开销大）；批量导入时建议全部插入后调用一次 flush()
         """
         if len(texts) != len(embeddings):
             raise ValueError("文本和向量数量必须一致")
         
         collection = self.get_collection()
         
-        # 准备数据
+        # 准备数据（连续 float32 矩阵可整块序列化，无需逐个转换 Python float）
         entities = [
             texts,
-            embeddings
+            np.ascontiguousarray(embeddings, dtype=np.float32)
         ]
         
         # 插入数据
         collection.insert(entities)
-        collection.flush()
+        if flush:
+            collection.flush()
         
-        print(f"✓ 成功插入 {len(texts)} 条文档")
+        logger.info("成功插入 %d 条文档", len(texts))
     
-    def search(self, query_embedding: List[float], top_k: int = 5) -> List[dict]:
+    def flush(self):
+        """将当前集合的写入落盘（seal segment），批量写入/删除结束后调用一次即可"""
+        self.get_collection().flush()
+    
+    def search(self, query_embedding: Union[List[float], np.ndarray], top_k: int = 5) -> List[dict]:
         """
         搜索相似文档
         
@@ -134,35 +169,35 @@ class MilvusClient:
             搜索结果列表，每个结果包含id、text、distance等信息
         """
         collection = self.get_collection()
-        collection.load()
+        self._ensure_loaded(collection)
         
         # 执行搜索
-        search_params = {"metric_type": "L2", "params": {"nprobe": 10}}
         results = collection.search(
-            data=[query_embedding],
+            data=np.asarray(query_embedding, dtype=np.float32).reshape(1, -1),
             anns_field="embedding",
-            param=search_params,
+            param=_SEARCH_PARAMS,
             limit=top_k,
             output_fields=["text"]
         )
         
-        # 格式化结果
-        search_results = []
-        for hits in results:
-            for hit in hits:
-                search_results.append({
-                    "id": hit.id,
-                    "text": hit.entity.get("text"),
-                    "distance": hit.distance,
-                    "score": 1 / (1 + hit.distance)  # 将距离转换为相似度分数
-                })
-        
-        return search_results
+        # 格式化结果：距离一次性收集为数组，向量化地转换为相似度分数
+        hits = results[0]
+        distances = np.fromiter((hit.distance for hit in hits), dtype=np.float64, count=len(hits))
+        scores = 1.0 / (1.0 + distances)
+        return [
+            {
+                "id": hit.id,
+                "text": hit.entity.get("text"),
+                "distance": distance,
+                "score": score,
+            }
+            for hit, distance, score in zip(hits, distances.tolist(), scores.tolist())
+        ]
     
     def get_collection_stats(self) -> dict:
         """获取集合统计信息"""
         collection = self.get_collection()
-        collection.load()
+        self._ensure_loaded(collection)
         
         num_entities = collection.num_entities
         return {
@@ -171,19 +206,16 @@ class MilvusClient:
         }
     
     def is_connected(self) -> bool:
-        """检查是否已连接到Milvus"""
-        try:
-            connections.get_connection_addr(self.connection_name)
-            return True
-        except:
-            return False
+        """检查是否已连接到Milvus（connect 后直接读标志位，否则查询连接表，不依赖异常）"""
+        return self._connected or connections.has_connection(self.connection_name)
     
-    def delete_document(self, doc_id: int) -> bool:
+    def delete_document(self, doc_id: int, flush: bool = False) -> bool:
         """
         根据ID删除单个文档
         
         Args:
             doc_id: 文档ID
+            flush: 是否立即 flush（默认否，delete 写入后即生效）
             
         Returns:
             是否删除成功
@@ -191,19 +223,21 @@ class MilvusClient:
         collection = self.get_collection()
         try:
             collection.delete(expr=f"id == {doc_id}")
-            collection.flush()
-            print(f"✓ 成功删除文档 ID: {doc_id}")
+            if flush:
+                collection.flush()
+            logger.info("成功删除文档 ID: %s", doc_id)
             return True
         except Exception as e:
-            print(f"✗ 删除文档失败: {e}")
+            logger.error("删除文档失败: %s", e)
             return False
     
-    def delete_documents(self, doc_ids: List[int]) -> int:
+    def delete_documents(self, doc_ids: List[int], flush: bool = False) -> int:
         """
         批量删除文档
         
         Args:
             doc_ids: 文档ID列表
+            flush: 是否立即 flush（默认否）
             
         Returns:
             成功删除的文档数量
@@ -213,21 +247,21 @@ class MilvusClient:
         
         collection = self.get_collection()
         try:
-            # 构建删除表达式
-            ids_str = ",".join([str(id) for id in doc_ids])
-            expr = f"id in [{ids_str}]"
-            
-            collection.delete(expr=expr)
-            collection.flush()
+            # 按 _IN_EXPR_CHUNK 分批构建删除表达式
+            for start in range(0, len(doc_ids), _IN_EXPR_CHUNK):
+                ids_str = ",".join(map(str, doc_ids[start:start + _IN_EXPR_CHUNK]))
+                collection.delete(expr=f"id in [{ids_str}]")
+            if flush:
+                collection.flush()
             
             deleted_count = len(doc_ids)
-            print(f"✓ 成功删除 {deleted_count} 条文档")
+            logger.info("成功删除 %d 条文档", deleted_count)
             return deleted_count
         except Exception as e:
-            print(f"✗ 批量删除文档失败: {e}")
+            logger.error("批量删除文档失败: %s", e)
             return 0
     
-    def update_document(self, doc_id: int, text: str, embedding: List[float]) -> bool:
+    def update_document(self, doc_id: int, text: str, embedding: Union[List[float], np.ndarray], flush: bool = False) -> bool:
         """
         更新文档内容
         
@@ -238,36 +272,35 @@ class MilvusClient:
             doc_id: 文档ID
             text: 新的文档文本
             embedding: 新的向量
+            flush: 是否在插入新文档后 flush 一次（默认否）
             
         Returns:
             是否更新成功
         """
         collection = self.get_collection()
         try:
-            # 检查文档是否存在
-            existing_doc = self.get_document(doc_id)
-            if not existing_doc:
-                print(f"✗ 文档 ID: {doc_id} 不存在")
-                return False
-            
             # Milvus的更新操作：先删除再插入
             # 注意：由于auto_id=True，新插入的文档会有新的ID
-            collection.delete(expr=f"id == {doc_id}")
-            collection.flush()
+            # 由 delete 返回的 delete_count 判断文档是否存在，省去一次 load + query
+            result = collection.delete(expr=f"id == {doc_id}")
+            if result.delete_count == 0:
+                logger.error("文档 ID: %s 不存在", doc_id)
+                return False
             
-            # 插入更新后的数据
+            # 插入更新后的数据（新旧记录主键不同，删除与插入之间无需 flush）
             entities = [
                 [text],
-                [embedding]
+                np.asarray(embedding, dtype=np.float32).reshape(1, -1)
             ]
             collection.insert(entities)
-            collection.flush()
+            if flush:
+                collection.flush()
             
-            print(f"✓ 成功更新文档（原ID: {doc_id}，新文档已插入）")
-            print("  注意：由于使用auto_id，新文档会有新的ID")
+            logger.info("成功更新文档（原ID: %s，新文档已插入）", doc_id)
+            logger.info("注意：由于使用auto_id，新文档会有新的ID")
             return True
         except Exception as e:
-            print(f"✗ 更新文档失败: {e}")
+            logger.error("更新文档失败: %s", e)
             return False
     
     def get_document(self, doc_id: int) -> Optional[dict]:
@@ -278,10 +311,10 @@ class MilvusClient:
             doc_id: 文档ID
             
         Returns:
-            文档信息字典，包含id、text、embedding，如果不存在则返回None
+            文档信息字典，包含id、text、embedding（float32 ndarray），如果不存在则返回None
         """
         collection = self.get_collection()
-        collection.load()
+        self._ensure_loaded(collection)
         
         try:
             # 使用query方法查询
@@ -291,12 +324,14 @@ class MilvusClient:
             )
             
             if results:
-                return results[0]
+                row = results[0]
+                row["embedding"] = np.asarray(row["embedding"], dtype=np.float32)
+                return row
             else:
-                print(f"未找到文档 ID: {doc_id}")
+                logger.warning("未找到文档 ID: %s", doc_id)
                 return None
         except Exception as e:
-            print(f"✗ 查询文档失败: {e}")
+            logger.error("查询文档失败: %s", e)
             return None
     
     def list_collections(self) -> List[str]:
@@ -310,7 +345,7 @@ class MilvusClient:
             collections = utility.list_collections()
             return collections
         except Exception as e:
-            print(f"✗ 列出集合失败: {e}")
+            logger.error("列出集合失败: %s", e)
             return []
     
     def delete_collection(self, collection_name: Optional[str] = None) -> bool:
@@ -326,12 +361,15 @@ class MilvusClient:
         name = collection_name or self.collection_name
         
         if not utility.has_collection(name):
-            print(f"集合 '{name}' 不存在")
+            logger.warning("集合 '%s' 不存在", name)
             return False
         
         try:
             utility.drop_collection(name)
-            print(f"✓ 成功删除集合 '{name}'")
+            self._loaded.discard(name)
+            if self._collection is not None and self._collection.name == name:
+                self._collection = None
+            logger.info("成功删除集合 '%s'", name)
             
             # 如果删除的是当前集合，重置集合名称
             if name == self.collection_name:
@@ -339,7 +377,7 @@ class MilvusClient:
             
             return True
         except Exception as e:
-            print(f"✗ 删除集合失败: {e}")
+            logger.error("删除集合失败: %s", e)
             return False
     
     def clear_collection(self, collection_name: Optional[str] = None) -> bool:
@@ -355,35 +393,27 @@ class MilvusClient:
         name = collection_name or self.collection_name
         
         if not utility.has_collection(name):
-            print(f"集合 '{name}' 不存在")
+            logger.warning("集合 '%s' 不存在", name)
             return False
         
         try:
             collection = Collection(name)
-            collection.load()
             
-            # 获取所有文档ID
-            results = collection.query(
-                expr="id >= 0",  # 查询所有文档
-                output_fields=["id"]
-            )
-            
-            if not results:
-                print(f"集合 '{name}' 已经是空的")
+            # num_entities 只读元数据，无需把所有主键 query 回客户端
+            num_entities = collection.num_entities
+            if num_entities == 0:
+                logger.info("集合 '%s' 已经是空的", name)
                 return True
             
-            # 删除所有文档
-            doc_ids = [doc["id"] for doc in results]
-            ids_str = ",".join([str(id) for id in doc_ids])
-            expr = f"id in [{ids_str}]"
-            
-            collection.delete(expr=expr)
+            # 直接用范围表达式删除所有文档
+            self._ensure_loaded(collection)
+            collection.delete(expr="id >= 0")
             collection.flush()
             
-            print(f"✓ 成功清空集合 '{name}'，删除了 {len(doc_ids)} 条文档")
+            logger.info("成功清空集合 '%s'，删除了约 %d 条文档", name, num_entities)
             return True
         except Exception as e:
-            print(f"✗ 清空集合失败: {e}")
+            logger.error("清空集合失败: %s", e)
             return False
     
     def query_by_ids(self, doc_ids: List[int]) -> List[dict]:
@@ -394,26 +424,29 @@ class MilvusClient:
             doc_ids: 文档ID列表
             
         Returns:
-            文档信息列表
+            文档信息列表（embedding 为 float32 ndarray）
         """
         if not doc_ids:
             return []
         
         collection = self.get_collection()
-        collection.load()
+        self._ensure_loaded(collection)
         
         try:
-            # 构建查询表达式
-            ids_str = ",".join([str(id) for id in doc_ids])
-            expr = f"id in [{ids_str}]"
-            
-            results = collection.query(
-                expr=expr,
-                output_fields=["id", "text", "embedding"]
-            )
+            # 按 _IN_EXPR_CHUNK 分批构建查询表达式
+            results = []
+            for start in range(0, len(doc_ids), _IN_EXPR_CHUNK):
+                ids_str = ",".join(map(str, doc_ids[start:start + _IN_EXPR_CHUNK]))
+                results.extend(collection.query(
+                    expr=f"id in [{ids_str}]",
+                    output_fields=["id", "text", "embedding"]
+                ))
             
+            # 向量转为 float32 ndarray，比 Python float 列表省内存
+            for row in results:
+                row["embedding"] = np.asarray(row["embedding"], dtype=np.float32)
             return results
         except Exception as e:
-            print(f"✗ 批量查询文档失败: {e}")
+            logger.error("批量查询文档失败: %s", e)
             return []
 
@@ -3,11 +3,33 @@ Milvus MVP 包初始化
 
 该包提供最小可行的向量检索功能（连接、集合管理、CRUD、搜索），
 并保持结构化、可扩展的目录布局。
+
+导出的类按需导入（PEP 562），`import milvus_mvp` 不会立即加载 pymilvus / sentence-transformers。
 """
 
-from .config import MilvusSettings
-from .client import MilvusClient
-from .vectorizer import TextVectorizer
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .config import MilvusSettings
+    from .client import MilvusClient, SearchBatch
+    from .vectorizer import TextVectorizer
+
+__all__ = ["MilvusSettings", "MilvusClient", "SearchBatch", "TextVectorizer"]
+
+_LAZY_EXPORTS = {
+    "MilvusSettings": ".config",
+    "MilvusClient": ".client",
+    "SearchBatch": ".client",
+    "TextVectorizer": ".vectorizer",
+}
+
 
-__all__ = ["MilvusSettings", "MilvusClient", "TextVectorizer"]
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
 
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
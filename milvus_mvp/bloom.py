@@ -0,0 +1,65 @@
+"""
+分块（register-blocked）Bloom 过滤器
+
+用于在客户端记录“可能存在”的主键集合：
+- 每个 key 只落在一个 64 位块内，8 个 bit 都由同一次哈希拆分得到，一次内存访问即可完成判定
+- 判定为“不存在”时一定不存在；判定为“存在”时有少量误判（默认配置约 2%）
+- 只支持添加，不支持删除；删除后的 key 仍会被判定为“可能存在”，只影响短路效果，不影响正确性
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+_BITS_PER_HASH = 6  # 2**6 = 64，对应块内 bit 位置
+_NUM_HASHES = 8
+
+
+def _splitmix64(keys: np.ndarray) -> np.ndarray:
+    """对 uint64 数组做 splitmix64 混淆，得到分布均匀的 64 位哈希。"""
+    with np.errstate(over="ignore"):
+        z = keys + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return (z ^ (z >> np.uint64(31))) & _MASK64
+
+
+class BlockedBloomFilter:
+    """
+    面向整数主键的分块 Bloom 过滤器。
+
+    参数：
+    - capacity：预期元素个数，超出后误判率上升（但仍不会漏判）
+    - bits_per_key：每个元素分配的 bit 数，10 对应约 2% 误判率
+    """
+
+    def __init__(self, capacity: int = 1_000_000, bits_per_key: int = 10):
+        n_blocks = max(1, (capacity * bits_per_key + 63) // 64)
+        # 块数取 2 的幂，定位块时用位与代替取模
+        n_blocks = 1 << (n_blocks - 1).bit_length()
+        self._blocks = np.zeros(n_blocks, dtype=np.uint64)
+        self._block_mask = np.uint64(n_blocks - 1)
+
+    def _locate(self, keys: Iterable[int]):
+        """返回每个 key 所在块的下标以及块内 mask。"""
+        h = _splitmix64(np.asarray(list(keys), dtype=np.int64).astype(np.uint64))
+        index = (h & self._block_mask).astype(np.intp)
+        mask = np.zeros_like(h)
+        for i in range(_NUM_HASHES):
+            shift = np.uint64(16 + i * _BITS_PER_HASH)
+            mask |= np.uint64(1) << ((h >> shift) & np.uint64(63))
+        return index, mask
+
+    def add_many(self, keys: Iterable[int]):
+        index, mask = self._locate(keys)
+        if index.size:
+            np.bitwise_or.at(self._blocks, index, mask)
+
+    def contains_many(self, keys: Iterable[int]) -> np.ndarray:
+        """批量判定，返回 bool 数组（False 表示一定不存在）。"""
+        index, mask = self._locate(keys)
+        return (self._blocks[index] & mask) == mask
+
+    def __contains__(self, key: int) -> bool:
+        return bool(self.contains_many([key])[0])
@@ -3,7 +3,7 @@
 
 作用可以理解为“总控台 / 调度中心”，负责：
 
-- 解析命令行参数（`--action`, `--query`, `--doc-id` 等）
+- 解析命令行参数（子命令 `insert` / `search` / ...，以及 `--query`, `--doc-id` 等）
 - 根据参数构造 Milvus 配置（`MilvusSettings`）
 - 按需创建 Milvus 客户端（`MilvusClient`）和向量化器（`TextVectorizer`）
 - 调用 service 层（`services.ingest` / `services.search`）完成真正业务逻辑
@@ -19,69 +19,168 @@
 """
 
 import argparse  # 解析命令行参数的标准库
+import atexit
+import functools
+import logging
 import sys       # 用于退出程序并返回状态码
-from typing import Optional, List
+from typing import TYPE_CHECKING, List, Optional
 
-# 领域层：直接封装 Milvus 的 CRUD / 集合管理 / 搜索
-from .client import MilvusClient
-# 配置层：集中管理 host/port/collection/index/search 等参数，可由环境变量覆盖
+# 配置层：集中管理 host/port/collection/index/search 等参数，可由环境变量覆盖（纯标准库，导入很轻）
 from .config import MilvusSettings
 # 日志：统一格式和日志级别
 from .log import get_logger
-# 向量化层：将文本转换为向量
-from .vectorizer import TextVectorizer
-# service 层：更高层级的“业务用例”（组合向量化 + Milvus 操作）
-from .services import ingest, search as search_service
+
+# 领域层（MilvusClient → pymilvus/gRPC）、向量化层（TextVectorizer → sentence-transformers/torch）
+# 和 service 层的导入开销可达数秒，统一推迟到真正需要的分支里再导入，
+# 让 --help 和 list-collections 等不需要模型的操作秒级启动。
+if TYPE_CHECKING:
+    from .client import MilvusClient
+    from .vectorizer import TextVectorizer
+
+# 内置示例文档（insert / both 未指定 --sample-file 时使用）
+_SAMPLE_DOCUMENTS = (
+    "Python是一种高级编程语言，广泛用于数据科学和机器学习。",
+    "Milvus是一个开源的向量数据库，专为AI应用设计。",
+    "机器学习是人工智能的一个分支，通过算法让计算机从数据中学习。",
+    "向量数据库可以高效地存储和检索高维向量数据。",
+    "自然语言处理是计算机科学和人工智能的一个领域。",
+    "深度学习使用神经网络来模拟人脑的学习过程。",
+    "数据科学结合了统计学、编程和领域专业知识来分析数据。",
+    "相似性搜索是向量数据库的核心功能之一。",
+)
 
 # 为当前模块（milvus_mvp.cli）创建一个 logger 实例，用于日志输出和记录，
 # 方便在终端中看到清晰的、带模块名和级别的日志信息。
 logger = get_logger(__name__)
 
 
-def parse_args() -> argparse.Namespace:
+def _common_parser(default=None) -> argparse.ArgumentParser:
     """
-    解析命令行参数。
+    主命令和各子命令共用的参数（连接 / 集合名 / 日志级别）。
 
-    只负责定义参数和 help 文案，不做任何业务逻辑。
-    返回 argparse.Namespace，后续交给 run_action 处理。
+    子命令使用 default=SUPPRESS 的副本：未显式传入时不写入 Namespace，
+    避免把主命令上已解析的值覆盖成 None。
     """
-    # `ArgumentParser` 会自动帮我们生成 `--help` 帮助文档
-    parser = argparse.ArgumentParser(description="Milvus 文档相似性搜索 MVP（命令行工具）")
+    common = argparse.ArgumentParser(add_help=False, argument_default=default)
 
     # === 基础连接参数（如果不传，则使用 MilvusSettings 中的默认值 / 环境变量） ===
-    parser.add_argument("--host", default=None, help="Milvus 服务器地址（可选，默认从环境变量/配置中读取）")
-    parser.add_argument("--port", type=int, default=None, help="Milvus 服务器端口（可选）")
-    parser.add_argument("--collection-name", help="集合名称（可选，覆盖默认集合名）")
-
-    # === 选择要执行的动作：覆盖最基础的 CRUD + 搜索 + 集合管理 ===
-    parser.add_argument(
-        "--action",
-        choices=[
-            "insert",          # 插入示例文档
-            "search",          # 仅搜索
-            "both",            # 先插入示例文档，再搜索（demo 用）
-            "delete",          # 删除文档（单个 / 批量）
-            "update",          # 更新文档（文本 + 向量）
-            "get",             # 按 ID 获取文档
-            "stats",           # 查看当前集合统计信息
-            "list-collections",# 列出所有集合
-            "drop-collection", # 删除集合
-            "clear",           # 清空集合数据
-        ],
-        default="both",
-        help="执行的操作",
+    common.add_argument("--host", help="Milvus 服务器地址（可选，默认从环境变量/配置中读取）")
+    common.add_argument("--port", type=int, help="Milvus 服务器端口（可选）")
+    common.add_argument("--collection-name", help="集合名称（可选，覆盖默认集合名）")
+
+    # === 日志级别（覆盖 LOG_LEVEL 环境变量） ===
+    common.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="日志级别（可选，默认读取 LOG_LEVEL 环境变量，未设置时为 INFO）",
     )
+    return common
+
 
-    # === 搜索相关参数（只在 action=search/both 时有意义） ===
+def _add_insert_args(parser: argparse.ArgumentParser):
+    """插入相关参数（insert / both）。"""
+    parser.add_argument("--doc-ids", help="主键列表，逗号分隔（auto_id=False 时必填，与文档一一对应）")
+    parser.add_argument("--sample-file", help="待插入文档文件（UTF-8，每行一条，空行忽略；默认使用内置示例文档）")
+
+
+def _add_query_args(parser: argparse.ArgumentParser):
+    """搜索相关参数（search / both）。"""
     parser.add_argument("--query", default="什么是向量数据库？", help="搜索查询文本")
     parser.add_argument("--top-k", type=int, default=None, help="返回最相似的 k 个结果（默认使用配置中的值）")
 
-    # === 文档 ID / 文本相关参数（CRUD 操作中会用到） ===
-    parser.add_argument("--doc-id", type=int, help="文档 ID（用于 delete/update/get）")
-    parser.add_argument("--doc-ids", help="文档 ID 列表，逗号分隔（用于批量删除）")
-    parser.add_argument("--text", help="文档文本（用于 update）")
 
-    return parser.parse_args()
+def _legacy_action_argv(argv: List[str]) -> List[str]:
+    """兼容旧的 `--action X` 写法：改写为 `X <其余参数>`（子命令也接受全部公共参数）。"""
+    for i, arg in enumerate(argv):
+        if arg == "--action" and i + 1 < len(argv):
+            return [argv[i + 1]] + argv[:i] + argv[i + 2:]
+        if arg.startswith("--action="):
+            return [arg.split("=", 1)[1]] + argv[:i] + argv[i + 1:]
+    return argv
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    构建命令行解析器。
+
+    只负责定义参数和 help 文案，不做任何业务逻辑。
+    每个操作是一个子命令（`app.py search --query ...`），各自只声明自己用得到的参数。
+    解析器与参数无关，进程内只构建一次（同一进程多次调用 main 时复用）。
+    """
+    common = _common_parser(argparse.SUPPRESS)
+
+    # `ArgumentParser` 会自动帮我们生成 `--help` 帮助文档
+    parser = argparse.ArgumentParser(
+        description="Milvus 文档相似性搜索 MVP（命令行工具）",
+        parents=[_common_parser()],
+    )
+
+    # === 子命令：覆盖最基础的 CRUD + 搜索 + 集合管理 ===
+    subparsers = parser.add_subparsers(dest="action", title="操作", metavar="ACTION")
+
+    sp = subparsers.add_parser("insert", parents=[common], help="插入示例文档")
+    _add_insert_args(sp)
+
+    sp = subparsers.add_parser("search", parents=[common], help="仅搜索")
+    _add_query_args(sp)
+
+    sp = subparsers.add_parser("both", parents=[common], help="先插入示例文档，再搜索（demo 用，默认操作）")
+    _add_query_args(sp)
+    _add_insert_args(sp)
+
+    sp = subparsers.add_parser("delete", parents=[common], help="删除文档（单个 / 批量）")
+    sp.add_argument("--doc-id", type=int, help="文档 ID")
+    sp.add_argument("--doc-ids", help="文档 ID 列表，逗号分隔（批量删除）")
+
+    sp = subparsers.add_parser("update", parents=[common], help="更新文档（文本 + 向量）")
+    sp.add_argument("--doc-id", type=int, required=True, help="文档 ID")
+    sp.add_argument("--text", required=True, help="新的文档文本")
+
+    sp = subparsers.add_parser("get", parents=[common], help="按 ID 获取文档")
+    sp.add_argument("--doc-id", type=int, required=True, help="文档 ID")
+
+    subparsers.add_parser("stats", parents=[common], help="查看当前集合统计信息")
+    subparsers.add_parser("list-collections", parents=[common], help="列出所有集合")
+    subparsers.add_parser("drop-collection", parents=[common], help="删除集合")
+    subparsers.add_parser("clear", parents=[common], help="清空集合数据")
+    return parser
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    解析命令行参数：不带子命令时默认执行 both。
+
+    返回 argparse.Namespace，后续交给 run_action 处理。
+    """
+    argv = _default_action_argv(_legacy_action_argv(list(sys.argv[1:] if argv is None else argv)))
+    return _build_parser().parse_args(argv)
+
+
+def _default_action_argv(argv: List[str]) -> List[str]:
+    """
+    未指定子命令时在公共参数之后插入 both（`app.py --query x`、`app.py --host h --top-k 3` 均按 both 执行）。
+
+    公共参数都带一个取值：`--host h` 跳过两个 token，`--host=h` 跳过一个；
+    遇到第一个非公共参数的选项时在它前面插入 both，遇到非选项 token 说明已给出子命令，原样返回。
+    """
+    common = _common_option_strings()
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ("-h", "--help") or not arg.startswith("-"):
+            return argv
+        option = arg.split("=", 1)[0]
+        if option not in common:
+            break
+        i += 1 if "=" in arg else 2
+    return argv[:i] + ["both"] + argv[i:]
+
+
+@functools.lru_cache(maxsize=None)
+def _common_option_strings() -> frozenset:
+    """公共参数的全部选项名（如 --host），用于判断子命令之前的 token。"""
+    return frozenset(opt for action in _common_parser()._actions for opt in action.option_strings)
 
 
 def _build_settings(args: argparse.Namespace) -> MilvusSettings:
@@ -106,17 +205,198 @@ def _build_settings(args: argparse.Namespace) -> MilvusSettings:
     return settings
 
 
-def _maybe_vectorizer(actions: List[str]) -> Optional[TextVectorizer]:
+@functools.lru_cache(maxsize=2)
+def _get_vectorizer(model_name: str, cache_dir: Optional[str] = None, normalize: bool = True) -> "TextVectorizer":
     """
-    根据动作是否需要向量化，懒加载 TextVectorizer。
+    获取进程内共享的 TextVectorizer（按模型名 + 缓存目录 + 是否归一化缓存）。
 
-    这样做的原因：
-    - 向量化模型较大，加载开销高
-    - 对于 list-collections / drop-collection 等操作，不需要加载模型
+    - 加载 sentence-transformers 模型需要数秒，同一进程内多次调用 run_action（测试、REPL 等）只加载一次
+    - 启用 cache_dir 时，重复文本直接命中磁盘缓存，跳过模型前向计算
     """
-    if any(act in actions for act in ["insert", "search", "both", "update"]):
-        return TextVectorizer()
-    return None
+    from .vectorizer import TextVectorizer
+
+    return TextVectorizer(model_name=model_name, cache_dir=cache_dir, normalize=normalize)
+
+
+def _build_vectorizer(settings: MilvusSettings) -> "TextVectorizer":
+    """按配置取得（缓存的）向量化器，只在需要向量化的 handler 中调用。"""
+    if not settings.normalize and settings.metric_type.upper() == "IP":
+        logger.warning("向量未归一化时 IP 不等于余弦相似度，建议开启 MILVUS_NORMALIZE 或改用 COSINE/L2 度量")
+    return _get_vectorizer(settings.model_name, settings.embedding_cache_dir or None, settings.normalize)
+
+
+def _load_documents(sample_file: Optional[str]) -> List[str]:
+    """返回待插入的文档：指定 sample_file 时按行读取（忽略空行），否则使用内置示例文档。"""
+    if not sample_file:
+        return list(_SAMPLE_DOCUMENTS)
+    from pathlib import Path
+
+    return [line for line in Path(sample_file).read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+# Milvus INT64 主键的取值范围
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _parse_ids(text: str) -> List[int]:
+    """
+    解析 --doc-ids "1,2,3"：逗号分隔，忽略空项与空白；
+    非整数或超出 int64 范围的 ID 直接报错，不会被截断成另一个 ID 传给 delete/insert。
+    """
+    ids: List[int] = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            doc_id = int(part)
+        except ValueError:
+            raise ValueError(f"无法解析 --doc-ids: {text!r}，应为逗号分隔的整数") from None
+        if not _INT64_MIN <= doc_id <= _INT64_MAX:
+            raise ValueError(f"--doc-ids 中的 ID 超出 int64 范围: {part}")
+        ids.append(doc_id)
+    return ids
+
+
+def _ensure_collection(client: "MilvusClient", dimension: int, with_index: bool = True):
+    """
+    确保目标集合存在（create_collection 是幂等操作，已存在时直接返回）。
+
+    dimension 取向量化模型的输出维度，保证集合字段与后续入库/检索的向量严格一致
+    （比如 all-mpnet-base-v2 输出 768 维，就要创建 768 维的向量字段）。
+    """
+    client.create_collection(dimension=dimension, with_index=with_index)
+
+
+# ==================== 各 action 的处理函数 ==================== #
+# 每个 handler 接收 (args, settings, client)，自行决定是否需要向量化器、是否需要创建集合。
+# 集合管理类操作（list-collections / drop-collection / stats / clear）不会加载模型，也不会触发建表。
+
+def _handle_insert(args: argparse.Namespace, settings: MilvusSettings, client: "MilvusClient"):
+    """插入示例文档（或 --sample-file 指定的文档）：先导入、后建索引（建表时不建索引，插入并 flush 后再一次性构建）。"""
+    from .services import ingest
+
+    vectorizer = _build_vectorizer(settings)
+    _ensure_collection(client, vectorizer.get_dimension(), with_index=False)
+
+    documents = _load_documents(args.sample_file)
+    # auto_id=False 时需要显式主键，通过 --doc-ids 传入（与示例文档一一对应）
+    ids = None
+    if not settings.auto_id:
+        if not args.doc_ids:
+            raise ValueError("auto_id=False 时 insert 操作需要 --doc-ids 指定主键")
+        ids = _parse_ids(args.doc_ids)
+    count = ingest.insert_texts(client, vectorizer, documents, ids=ids)
+    # 整批插入完成后统一 flush 一次，再构建索引（已有索引时为空操作）
+    client.flush()
+    client.build_index()
+    logger.info("插入完成，数量: %s", count)
+
+
+def _handle_search(args: argparse.Namespace, settings: MilvusSettings, client: "MilvusClient"):
+    """执行向量搜索并打印结果。"""
+    from .services import search as search_service
+
+    vectorizer = _build_vectorizer(settings)
+    _ensure_collection(client, vectorizer.get_dimension())
+    # 建表后统一 load 一次，之后的检索直接复用已加载状态
+    client.get_collection(load=True)
+
+    top_k = args.top_k or settings.top_k_default
+    batch = search_service.search_texts(client, vectorizer, args.query, top_k=top_k)
+    if not logger.isEnabledFor(logging.INFO):
+        # 日志被静默时连格式化都省掉
+        return
+    # 所有命中拼成一条日志记录输出，避免每条结果一次 logger.info（加锁 + 格式化 + 写 handler）
+    lines = [
+        "[%d] ID: %s, score: %.4f, distance: %.4f, text: %s"
+        % (i + 1, batch.ids[i], batch.scores[i], batch.distances[i], batch.texts[i])
+        for i in range(len(batch))
+    ]
+    logger.info("搜索结果 (%d):\n%s", len(batch), "\n".join(lines))
+
+
+def _handle_both(args: argparse.Namespace, settings: MilvusSettings, client: "MilvusClient"):
+    """先插入示例文档，再搜索（demo 用），两步通过 _get_vectorizer 共用同一个模型实例。"""
+    _handle_insert(args, settings, client)
+    _handle_search(args, settings, client)
+
+
+def _handle_delete(args: argparse.Namespace, settings: MilvusSettings, client: "MilvusClient"):
+    """单个或批量删除（不需要模型）。"""
+    from .services import ingest
+
+    if args.doc_ids:
+        # 支持 --doc-ids "1,2,3"
+        ids = _parse_ids(args.doc_ids)
+        ingest.delete_by_ids(client, ids)
+    elif args.doc_id is not None:
+        ingest.delete_by_ids(client, [args.doc_id])
+    else:
+        raise ValueError("delete 操作需要 --doc-id 或 --doc-ids")
+
+
+def _handle_update(args: argparse.Namespace, settings: MilvusSettings, client: "MilvusClient"):
+    """更新指定 ID 的文档（文本 + 向量）。"""
+    from .services import ingest
+
+    if args.doc_id is None or not args.text:
+        raise ValueError("update 操作需要同时提供 --doc-id 和 --text")
+    ingest.update_text(client, _build_vectorizer(settings), args.doc_id, args.text)
+
+
+def _handle_get(args: argparse.Namespace, settings: MilvusSettings, client: "MilvusClient"):
+    """按 ID 获取文档（不需要模型）。"""
+    from .services import ingest
+
+    if args.doc_id is None:
+        raise ValueError("get 操作需要 --doc-id")
+    doc = ingest.get_by_id(client, args.doc_id)
+    if doc:
+        logger.info("文档: %s", doc)
+    else:
+        logger.info("未找到文档 ID: %s", args.doc_id)
+
+
+def _handle_stats(args: argparse.Namespace, settings: MilvusSettings, client: "MilvusClient"):
+    """集合统计信息（集合不存在时报错，而不是新建一个空集合）。"""
+    stats = client.get_collection_stats()
+    logger.info("集合统计: %s", stats)
+
+
+def _handle_list(args: argparse.Namespace, settings: MilvusSettings, client: "MilvusClient"):
+    """列出所有集合。"""
+    names = client.list_collections()
+    logger.info("集合列表 (%d): %s", len(names), names)
+
+
+def _handle_drop(args: argparse.Namespace, settings: MilvusSettings, client: "MilvusClient"):
+    """删除集合。"""
+    client.drop_collection(args.collection_name)
+
+
+def _handle_clear(args: argparse.Namespace, settings: MilvusSettings, client: "MilvusClient"):
+    """清空集合数据（保留 schema）。"""
+    client.clear_collection(args.collection_name)
+
+
+# 进程退出时断开连接的 atexit 钩子只注册一次
+_ATEXIT_REGISTERED = False
+
+# action -> handler 分发表
+HANDLERS = {
+    "insert": _handle_insert,
+    "search": _handle_search,
+    "both": _handle_both,
+    "delete": _handle_delete,
+    "update": _handle_update,
+    "get": _handle_get,
+    "stats": _handle_stats,
+    "list-collections": _handle_list,
+    "drop-collection": _handle_drop,
+    "clear": _handle_clear,
+}
 
 
 def run_action(args: argparse.Namespace):
@@ -124,129 +404,34 @@ def run_action(args: argparse.Namespace):
     根据解析好的参数执行对应操作。
 
     职责：
-    - 初始化配置 (MilvusSettings)、客户端 (MilvusClient)、向量化器 (TextVectorizer)
-    - 决定是否需要创建 / 加载集合
-    - 调用 service 层（ingest / search_service）和 client 的基础 CRUD/统计/集合操作
-    - 统一异常捕获和日志输出
+    - 初始化配置 (MilvusSettings) 和客户端 (MilvusClient)
+    - 通过 HANDLERS 分发表找到 action 对应的 handler，由 handler 决定是否加载模型、是否创建集合
+    - 统一连接管理、异常捕获和日志输出
+
+    连接在进程生命周期内保持：这里不在每次操作后 disconnect，同一进程内多次调用 run_action
+    会复用已建立的连接，进程退出时由 atexit 注册的 close_all_connections 统一断开。
     """
+    from .client import MilvusClient, close_all_connections
+
+    global _ATEXIT_REGISTERED
+    if not _ATEXIT_REGISTERED:
+        atexit.register(close_all_connections)
+        _ATEXIT_REGISTERED = True
+
     # 1. 构建配置对象（合并环境变量和命令行参数）
     #    之后所有 MilvusClient 的行为（host/port/collection/index/search）都受这个 settings 控制
     settings = _build_settings(args)
-    client = MilvusClient(settings=settings)
-
-    # 2. 根据 action 决定是否预先加载向量化模型
-    #    注意：有些操作（list-collections / drop-collection 等）完全不需要模型
-    vectorizer = _maybe_vectorizer([args.action])
+    handler = HANDLERS[args.action]
 
     try:
-        # 3. 连接 Milvus（如果已经连接过，PyMilvus 会做幂等处理）
-        client.connect()
-
-        # 4. 除了极少数集合管理操作以外（比如列集合、删除集合），绝大多数操作都要依赖目标集合存在，所以下面要按需创建集合
-        # need_collection 为 True 代表当前 action 不是 ["list-collections", "drop-collection"] 之一，即“需要集合”
-        need_collection = args.action not in ["list-collections", "drop-collection"]
-        if need_collection:
-            # 这里有个细致的判断：
-            #   - 如果已经有 vectorizer（即向量化器已加载），则优先选用该模型的输出向量维度
-            #     保证集合和后续入库/检索的向量匹配（比如模型 all-mpnet-base-v2 输出是 768维，要创建 768维向量字段）。
-            #   - 如果没有加载 vectorizer（实际上在 insert/search/both/update 时会加载，兜底策略），
-            #     则退回用 settings.dimension（一般是配置文件或环境变量的默认维度，比如 384）。
-            # 这样保证了：集合字段与后面所有插/查/向量维度都严格一致，不易出错。
-            dim = vectorizer.get_dimension() if vectorizer else settings.dimension
-            # create_collection 是幂等操作，如果集合已存在不会重复创建
-            # 这里会按 dim 参数创建 embedding 向量字段，索引类型/主键/分区已封装在 MilvusClient 里
-            client.create_collection(dimension=dim)
-
-        # 5. insert / both：插入内置示例文档
-        if args.action in ["insert", "both"]:
-            # 示例文档（MVP 里直接写在代码里，真实项目里可以改为从文件/DB 加载）
-            documents = [
-                "Python是一种高级编程语言，广泛用于数据科学和机器学习。",
-                "Milvus是一个开源的向量数据库，专为AI应用设计。",
-                "机器学习是人工智能的一个分支，通过算法让计算机从数据中学习。",
-                "向量数据库可以高效地存储和检索高维向量数据。",
-                "自然语言处理是计算机科学和人工智能的一个领域。",
-                "深度学习使用神经网络来模拟人脑的学习过程。",
-                "数据科学结合了统计学、编程和领域专业知识来分析数据。",
-                "相似性搜索是向量数据库的核心功能之一。",
-            ]
-            # 理论上这里一定需要向量化器，做一次兜底判断
-            if not vectorizer:
-                vectorizer = TextVectorizer()
-            count = ingest.insert_texts(client, vectorizer, documents)
-            logger.info("插入完成，数量: %s", count)
-
-        # 6. search / both：执行向量搜索
-        if args.action in ["search", "both"]:
-            if not vectorizer:
-                vectorizer = TextVectorizer()
-            top_k = args.top_k or settings.top_k_default
-            results = search_service.search_texts(client, vectorizer, args.query, top_k=top_k)
-            logger.info("搜索结果数量: %d", len(results))
-            for idx, res in enumerate(results, 1):
-                logger.info(
-                    "[%d] ID: %s, score: %.4f, distance: %.4f, text: %s",
-                    idx,
-                    res["id"],
-                    res["score"],
-                    res["distance"],
-                    res["text"],
-                )
-
-        # 7. delete：单个或批量删除
-        if args.action == "delete":
-            if args.doc_ids:
-                # 支持 --doc-ids "1,2,3"
-                ids = [int(i.strip()) for i in args.doc_ids.split(",") if i.strip()]
-                ingest.delete_by_ids(client, ids)
-            elif args.doc_id is not None:
-                ingest.delete_by_ids(client, [args.doc_id])
-            else:
-                raise ValueError("delete 操作需要 --doc-id 或 --doc-ids")
-
-        # 8. update：更新指定 ID 的文档
-        if args.action == "update":
-            if args.doc_id is None or not args.text:
-                raise ValueError("update 操作需要同时提供 --doc-id 和 --text")
-            if not vectorizer:
-                vectorizer = TextVectorizer()
-            ingest.update_text(client, vectorizer, args.doc_id, args.text)
-
-        # 9. get：按 ID 获取文档
-        if args.action == "get":
-            if args.doc_id is None:
-                raise ValueError("get 操作需要 --doc-id")
-            doc = ingest.get_by_id(client, args.doc_id)
-            if doc:
-                logger.info("文档: %s", doc)
-            else:
-                logger.info("未找到文档 ID: %s", args.doc_id)
-
-        # 10. stats：集合统计信息
-        if args.action == "stats":
-            stats = client.get_collection_stats()
-            logger.info("集合统计: %s", stats)
-
-        # 11. list-collections：列出所有集合
-        if args.action == "list-collections":
-            names = client.list_collections()
-            logger.info("集合列表 (%d): %s", len(names), names)
-
-        # 12. drop-collection：删除集合
-        if args.action == "drop-collection":
-            client.drop_collection(args.collection_name)
-
-        # 13. clear：清空集合
-        if args.action == "clear":
-            client.clear_collection(args.collection_name)
-
+        # 2. 连接 Milvus（本进程内已经连接过时直接复用；keep_alive 使退出 with 块时保留连接）
+        with MilvusClient(settings=settings, keep_alive=True) as client:
+            # 3. 交给具体 handler 执行
+            handler(args, settings, client)
     except Exception as exc:
         # 统一异常处理，打印堆栈并以非 0 状态码退出
         logger.exception("操作失败: %s", exc)
         sys.exit(1)
-    finally:
-        # 确保连接被正常关闭
-        client.disconnect()
 
 
 def main():
@@ -258,6 +443,9 @@ def main():
     - 方便被其他 Python 代码复用：`from milvus_mvp.cli import main`
     """
     args = parse_args()
+    if args.log_level:
+        # 包内各模块的 logger 都挂在 "milvus_mvp" 之下，设置父 logger 即可整体生效
+        get_logger().setLevel(args.log_level)
     run_action(args)
 
 
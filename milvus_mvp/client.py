@@ -12,22 +12,122 @@ Milvus 客户端封装（领域层）
 4) 搜索与统计 search / get_collection_stats
 """
 
-from typing import List, Optional, Dict, Any
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
+import numpy as np
 from pymilvus import (
     connections,  # 连接管理
     Collection,   # 集合对象
     FieldSchema,  # 字段定义
     CollectionSchema,  # 集合 schema 定义
     DataType,     # 字段类型枚举
+    MilvusException,  # 服务端错误
     utility,      # 工具函数：集合存在检测 / 列表等
 )
 
+from .bloom import BlockedBloomFilter
 from .config import MilvusSettings
 from .log import get_logger
 
 logger = get_logger(__name__)
 
+# 单条 "id in [...]" 表达式最多携带的主键数，限制表达式长度与服务端解析开销
+_IN_EXPR_CHUNK = 1024
+
+# 主键分片 delete/query 的最大并发数（gRPC 通道支持 HTTP/2 多路复用，分片请求可同时在途）
+_IN_EXPR_WORKERS = 8
+
+# 全量扫描主键时每批返回的条数（query_iterator），客户端内存占用与总行数无关
+_SCAN_BATCH = 10000
+
+# 单条查询命中数达到该值时改用 _numba_kernels 做分数转换（按需导入，小结果集直接用 NumPy）
+_KERNEL_MIN_HITS = 1024
+
+# 集合名列表的客户端缓存有效期（秒）
+_COLLECTION_LIST_TTL = 5.0
+
+# settings.vector_dtype -> (向量字段类型, 客户端传输用的 NumPy dtype)
+_VECTOR_DTYPES = {
+    "float32": (DataType.FLOAT_VECTOR, np.float32),
+    "float16": (DataType.FLOAT16_VECTOR, np.float16),
+}
+
+# 服务端拒绝表达式时的错误码：ErrParameterInvalid（Milvus >= 2.3），更早版本为 ErrorCode.IllegalArgument
+_PARAMETER_INVALID = 1100
+_LEGACY_ILLEGAL_ARGUMENT = 5
+
+# 后台写入线程的停止标记
+_WRITER_STOP = object()
+
+# 本进程内已建立的连接（别名 -> (host, port)），跨 MilvusClient 实例共享；
+# 同一地址的别名重复 connect 时直接复用，省去 TCP / gRPC 握手
+_CONNECTED_ALIASES: Dict[str, Tuple[str, int]] = {}
+
+
+def _connect_alias(alias: str, host: str, port: int):
+    """建立（或复用）指定别名的连接；别名已连到其他地址时先断开再重连。"""
+    address = (host, port)
+    if _CONNECTED_ALIASES.get(alias) == address and connections.has_connection(alias):
+        return
+    if alias in _CONNECTED_ALIASES:
+        connections.disconnect(alias)
+    connections.connect(alias=alias, host=host, port=port)
+    _CONNECTED_ALIASES[alias] = address
+
+
+def _disconnect_alias(alias: str):
+    connections.disconnect(alias)
+    _CONNECTED_ALIASES.pop(alias, None)
+
+
+def close_all_connections():
+    """
+    断开本进程内由 MilvusClient 建立的全部连接。
+
+    CLI 模式下不在每次操作后断开，而是通过 atexit 在进程退出时统一调用本函数。
+    """
+    for alias in list(_CONNECTED_ALIASES):
+        try:
+            _disconnect_alias(alias)
+        except Exception as exc:
+            logger.warning("断开连接 %s 时发生异常: %s", alias, exc)
+
+
+@dataclass
+class SearchBatch:
+    """
+    单条查询的检索结果（列式存储）。
+
+    - ids / distances / scores 为 NumPy 数组，texts 为文本列表，下标一一对应，按相似度从高到低排列
+    - 相比每个命中一个 dict，列式结构分配的对象少得多，也便于直接做向量化后处理
+    - 需要旧的 List[dict] 形式时调用 to_dicts()
+    """
+
+    __slots__ = ("ids", "distances", "scores", "texts")
+
+    ids: np.ndarray
+    distances: np.ndarray
+    scores: np.ndarray
+    texts: List[Optional[str]]
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """转换为 List[dict]，每个 dict 含 id/text/distance/score。"""
+        return [
+            {"id": doc_id, "text": text, "distance": distance, "score": score}
+            for doc_id, text, distance, score in zip(
+                self.ids.tolist(), self.texts, self.distances.tolist(), self.scores.tolist()
+            )
+        ]
+
 
 class MilvusClient:
     """
@@ -39,10 +139,62 @@ class MilvusClient:
     - 不做向量化与业务流程，方便被 service 层复用或被其他入口调用。
     """
 
-    def __init__(self, settings: Optional[MilvusSettings] = None, connection_name: str = "default"):
+    def __init__(
+        self,
+        settings: Optional[MilvusSettings] = None,
+        connection_name: str = "default",
+        keep_alive: bool = False,
+    ):
         self.settings = settings or MilvusSettings()
         self.connection_name = connection_name
+        # 作为上下文管理器使用时，keep_alive=True 则退出 with 块不断开连接（留给 close_all_connections 统一处理）
+        self.keep_alive = keep_alive
+        # 本实例是否已 connect（connect 置位、disconnect 清除），is_connected 直接读取
+        self._connected = False
         self.collection_name = self.settings.collection_name
+        # 主键表达式的固定前缀，每个实例只拼接一次，热路径上直接字符串拼接
+        id_field = self.settings.id_field
+        self._id_eq_prefix = f"{id_field} == "
+        self._id_in_prefix = f"{id_field} in ["
+        self._id_all_expr = f"{id_field} >= 0"
+        # 向量字段类型与传输 dtype：所有写入/检索向量在交给 PyMilvus 前统一转为 self._vector_np_dtype
+        try:
+            self._vector_field_type, self._vector_np_dtype = _VECTOR_DTYPES[self.settings.vector_dtype.lower()]
+        except KeyError:
+            raise ValueError(
+                f"不支持的 vector_dtype: {self.settings.vector_dtype}（可选 {', '.join(_VECTOR_DTYPES)}）"
+            ) from None
+        # 按主键查询的表达式模板：主键列表经 expr_params 以 int64 数组传输，服务端不必解析超长字面量；
+        # 服务端无法解析模板时（Milvus < 2.5）置为 False，之后直接使用字面量表达式；
+        # 删除/查询分块在线程池中并发执行，置位经 _expr_templates_lock 保护，只记录一次日志
+        self._id_in_template = f"{id_field} in {{ids}}"
+        self._expr_templates = True
+        self._expr_templates_lock = threading.Lock()
+        # 索引 / 检索参数在 settings 确定后就不再变化，构造时生成一次，热路径上直接复用
+        # （pymilvus 要求传入 dict 且会把规范化后的 "params" 写回，写回内容与原值一致，可安全共享）
+        self._index_params = self.settings.index_params()
+        self._search_params = self.settings.search_params()
+        # 度量值是否即相似度（IP/COSINE），每条查询换算 score 时直接读取，不再重复解析 metric_type
+        self._similarity = self.settings.is_similarity_metric()
+        # 连接池中的连接别名（首个为主连接），connect 时按 settings.channel_pool_size 建立
+        self._pool_aliases: List[str] = [connection_name]
+        self._rr = itertools.count()
+        # 并行写入使用的额外连接别名（按需创建，disconnect 时统一断开）
+        self._worker_aliases: List[str] = []
+        # 已 load 到内存的集合名，避免每次读操作都重复发起 load RPC
+        self._loaded: Set[str] = set()
+        # Collection 句柄缓存（集合名 -> 每个池连接上的 Collection），避免每次操作都 has_collection + 重建句柄
+        self._collections: Dict[str, List[Collection]] = {}
+        # 主键 Bloom 过滤器（集合名 -> 过滤器），仅在 settings.id_filter 开启时使用
+        self._id_filters: Dict[str, BlockedBloomFilter] = {}
+        # 集合名列表缓存 (获取时间, 集合名集合)，has_collection 判断在 TTL 内直接查缓存
+        self._coll_list_cache: Optional[Tuple[float, Set[str]]] = None
+        # 实体数缓存（集合名 -> (获取时间, num_entities)），有效期 settings.stats_ttl_s
+        self._stats_cache: Dict[str, Tuple[float, int]] = {}
+        # 后台写入线程（start_writer 启动，stage 投递，close_writer 收尾）
+        self._writer: Optional[threading.Thread] = None
+        self._write_queue: "queue.Queue[Any]" = queue.Queue()
+        self._writer_error: Optional[BaseException] = None
 
     # -------------------- 连接管理 -------------------- #
     def connect(self):
@@ -67,22 +219,66 @@ class MilvusClient:
              它会根据 alias/host/port 建立与 Milvus 服务端的实际连接。
            - 调用完成后，通过 logger 记录一条 info 日志，标明连接已建立。
 
-        4. 错误与异常：
+        4. 连接复用：
+           - 也可以用 `with MilvusClient(...) as client:`，进入时 connect，退出时 disconnect。
+           - 已建立的连接记录在模块级 _CONNECTED_ALIASES 中（别名 -> host/port），
+             同一进程内的其他 MilvusClient 实例再次 connect 时直接复用，不重复握手。
+
+        5. 错误与异常：
            - 如果提供的 host 不可达、端口错误、网络故障等，`connections.connect` 会抛出异常。
            - 本方法本身不做异常捕获，而是把异常留给上层处理（设计哲学是让调用方明确处理失败场景）。
 
-        5. 使用场景：
+        6. 使用场景：
            - 一般在程序启动或首次需要与 Milvus 交互前调用。
            - 如果已经连上了，重复调用也不会有副作用。
 
         总结：本方法是与 Milvus 建立基础连接的入口，细节交给 PyMilvus 封装，参数来源于配置对象，设计典型而清晰。
         """
-        connections.connect(
-            alias=self.connection_name,
-            host=self.settings.host,
-            port=self.settings.port,
+        _connect_alias(self.connection_name, self.settings.host, self.settings.port)
+        # 连接池：额外建立 channel_pool_size - 1 个独立连接，Collection 句柄在其间轮询，
+        # 避免所有并发请求挤在同一条 HTTP/2 连接上
+        self._pool_aliases = [self.connection_name]
+        for i in range(1, max(1, self.settings.channel_pool_size)):
+            alias = f"{self.connection_name}_p{i}"
+            _connect_alias(alias, self.settings.host, self.settings.port)
+            self._pool_aliases.append(alias)
+        self._collections.clear()
+        self._connected = True
+        logger.info(
+            "已连接 Milvus: %s:%s（连接数: %d）",
+            self.settings.host,
+            self.settings.port,
+            len(self._pool_aliases),
         )
-        logger.info("已连接 Milvus: %s:%s", self.settings.host, self.settings.port)
+        if self.settings.warmup_on_connect:
+            threading.Thread(target=self._warmup, name="milvus-warmup", daemon=True).start()
+
+    def _warmup(self):
+        """
+        预热当前集合（在后台线程执行，不阻塞 connect）：
+
+        - 集合存在且已建索引时 load（已加载时为空操作）
+        - 发一次 limit=1 的检索，触发服务端把向量/索引数据拉入缓存，首个真实查询不再承担冷启动开销
+        - 任何失败只记 debug 日志，真实请求会按正常路径重试 load
+        """
+        try:
+            collection = self._collection_handle(self.collection_name)
+            if collection is None or not collection.has_index():
+                return
+            self._ensure_loaded(collection)
+            dim = next(
+                f.params["dim"] for f in collection.schema.fields if f.name == self.settings.anns_field
+            )
+            collection.search(
+                data=np.ones((1, dim), dtype=self._vector_np_dtype),
+                anns_field=self.settings.anns_field,
+                param=self._search_params,
+                limit=1,
+                output_fields=[],
+            )
+            logger.debug("集合 %s 预热完成", self.collection_name)
+        except Exception as exc:
+            logger.debug("集合 %s 预热失败: %s", self.collection_name, exc)
 
     def disconnect(self):
         """
@@ -92,31 +288,48 @@ class MilvusClient:
         - 如果连接不存在，会捕获异常并记录 warning，不中断流程。
         - 上层一般在 finally 中调用，确保资源释放。
         """
+        self._connected = False
         try:
-            connections.disconnect(self.connection_name)
+            for alias in self._worker_aliases + self._pool_aliases[1:]:
+                _disconnect_alias(alias)
+            self._worker_aliases = []
+            self._pool_aliases = [self.connection_name]
+            self._collections.clear()
+            _disconnect_alias(self.connection_name)
             logger.info("已断开 Milvus 连接")
         except Exception as exc:
             logger.warning("断开连接时发生异常: %s", exc)
 
+    def __enter__(self) -> "MilvusClient":
+        """`with MilvusClient(...) as client:` 进入时建立连接。"""
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        """退出 with 块时断开连接（keep_alive=True 时保留连接供进程内复用）；不吞掉异常。"""
+        if not self.keep_alive:
+            self.disconnect()
+
     def is_connected(self) -> bool:
         """
-        检查连接状态（查询连接地址）。
+        检查连接状态。
 
+        - 本实例 connect 过且未 disconnect 时直接返回 True（只读一个布尔值，适合高频健康检查）
+        - 否则查询 PyMilvus 连接表（同名别名可能已由其他实例建立），不依赖异常判断
         返回：
-        - True：连接存在且可获取地址
-        - False：未连接或连接失效（内部捕获异常）
+        - True：连接存在
+        - False：未连接
         """
-        try:
-            connections.get_connection_addr(self.connection_name)
+        if self._connected:
             return True
-        except Exception:
-            return False
+        return connections.has_connection(self.connection_name)
 
     # -------------------- 集合管理 -------------------- #
     def create_collection(
         self,
         dimension: Optional[int] = None,
         collection_name: Optional[str] = None,
+        with_index: bool = True,
     ) -> Collection:
         """
         创建集合（如已存在则直接返回）。
@@ -124,11 +337,13 @@ class MilvusClient:
         - 字段设计：
           * id：INT64 主键，auto_id 取决于配置（MVP 默认 True）
           * text：VARCHAR，用于存储原文
-          * embedding：FLOAT_VECTOR，用于向量索引和检索
-        - 索引参数：由 settings.index_params() 给出，默认 IVF_FLAT + L2
+          * embedding：FLOAT_VECTOR（settings.vector_dtype=float16 时为 FLOAT16_VECTOR），用于向量索引和检索
+        - 索引参数：由 settings.index_params() 给出，默认 IVF_SQ8 + IP
         参数：
         - dimension：向量维度，默认取 settings.dimension
         - collection_name：集合名，默认取 settings.collection_name
+        - with_index：是否立即建索引。批量导入时传 False，先插入全部数据再调用 build_index()
+          一次性构建（DeferIndexing），避免插入过程中增量维护索引
         返回：
         - Collection 实例（已创建或已存在）
         异常：
@@ -139,9 +354,10 @@ class MilvusClient:
         if dimension is None:
             dimension = self.settings.dimension
 
-        if utility.has_collection(self.collection_name):
+        existing = self._collection_handle(self.collection_name)
+        if existing is not None:
             logger.info("集合已存在: %s", self.collection_name)
-            return Collection(self.collection_name)
+            return existing
 
         fields = [
             FieldSchema(
@@ -157,195 +373,730 @@ class MilvusClient:
             ),
             FieldSchema(
                 name=self.settings.anns_field,
-                dtype=DataType.FLOAT_VECTOR,
+                dtype=self._vector_field_type,
                 dim=dimension,
             ),
         ]
         schema = CollectionSchema(fields, description="Document similarity search")
         collection = Collection(self.collection_name, schema)
 
-        collection.create_index(self.settings.anns_field, self.settings.index_params())
+        self._collections[self.collection_name] = self._pool_handles(self.collection_name, collection)
+        self._coll_list_cache = None
         logger.info("已创建集合: %s", self.collection_name)
+        if with_index:
+            self.build_index()
         return collection
 
-    def get_collection(self) -> Collection:
-        """获取集合对象，不存在时抛出异常。"""
-        if not utility.has_collection(self.collection_name):
+    def build_index(self, index_params: Optional[Dict[str, Any]] = None):
+        """
+        为当前集合的向量字段建索引（已存在索引时直接返回，可重复调用）。
+
+        参数：
+        - index_params：索引参数，默认取 settings.index_params()（构造时缓存）
+        """
+        collection = self.get_collection()
+        if collection.has_index():
+            return
+        collection.create_index(self.settings.anns_field, index_params or self._index_params)
+        logger.info("已为集合 %s 创建索引", self.collection_name)
+
+    def get_collection(self, load: bool = False) -> Collection:
+        """
+        获取集合对象，不存在时抛出异常。
+
+        - load=True 时确保集合已加载（读操作需要）；每个集合只在首次访问时 load 一次，
+          之后由 self._loaded 记录状态，不再重复 RPC。
+        - 句柄按集合名缓存，只有首次访问才会发起 has_collection 检查。
+        """
+        collection = self._collection_handle(self.collection_name)
+        if collection is None:
             raise ValueError(f"集合 '{self.collection_name}' 不存在，请先创建集合")
-        return Collection(self.collection_name)
+        if load:
+            self._ensure_loaded(collection)
+        return collection
+
+    def _ensure_loaded(self, collection: Collection):
+        """确保集合已加载到内存：同一客户端内每个集合只发起一次 load RPC。"""
+        if collection.name not in self._loaded:
+            collection.load()
+            self._loaded.add(collection.name)
+
+    def _collection_handle(self, name: str) -> Optional[Collection]:
+        """
+        返回缓存的 Collection 句柄；首次访问时确认集合存在并缓存，集合不存在返回 None。
+
+        启用连接池时，每次调用在各池连接的句柄间轮询。
+        """
+        handles = self._collections.get(name)
+        if handles is None:
+            if not self._has_collection(name):
+                return None
+            handles = self._collections[name] = self._pool_handles(name)
+        if len(handles) == 1:
+            return handles[0]
+        return handles[next(self._rr) % len(handles)]
+
+    def _pool_handles(self, name: str, primary: Optional[Collection] = None) -> List[Collection]:
+        """为连接池中的每个连接构建一个 Collection 句柄（主连接可复用已有句柄）。"""
+        primary = primary or Collection(name)
+        return [primary] + [Collection(name, using=alias) for alias in self._pool_aliases[1:]]
 
     def list_collections(self) -> List[str]:
-        """列出当前 Milvus 实例中的所有集合名称。"""
-        return utility.list_collections()
+        """列出当前 Milvus 实例中的所有集合名称（顺带刷新集合名缓存）。"""
+        names = utility.list_collections()
+        self._coll_list_cache = (time.monotonic(), set(names))
+        return names
+
+    def _has_collection(self, name: str) -> bool:
+        """
+        判断集合是否存在。
+
+        TTL 内复用上一次 list_collections 的结果（一次 RPC 覆盖所有集合名），
+        过期后再刷新；本客户端创建/删除集合时会主动失效缓存。
+        """
+        cached = self._coll_list_cache
+        if cached is None or time.monotonic() - cached[0] >= _COLLECTION_LIST_TTL:
+            self.list_collections()
+            cached = self._coll_list_cache
+        return name in cached[1]
 
     def drop_collection(self, collection_name: Optional[str] = None):
         name = collection_name or self.collection_name
-        if not utility.has_collection(name):
+        if not self._has_collection(name):
             raise ValueError(f"集合 '{name}' 不存在")
         utility.drop_collection(name)
+        self._coll_list_cache = None
+        self._loaded.discard(name)
+        self._collections.pop(name, None)
+        self._id_filters.pop(name, None)
+        self._stats_cache.pop(name, None)
         logger.info("已删除集合: %s", name)
 
-    def clear_collection(self, collection_name: Optional[str] = None):
+    def clear_collection(self, collection_name: Optional[str] = None) -> int:
         """
         清空集合数据（保留 schema）。
 
         做法：
-        - 先 query 出所有 id
-        - 构造删除表达式批量删除
+        - 先用 num_entities（单次元数据调用）判断是否为空
+        - 直接用范围表达式 "id >= 0" 删除，无需先把全部主键 query 回客户端
+        - 服务端拒绝范围表达式时（较早的 Milvus 删除只接受 "id in [...]"），
+          退回 _delete_paged：query_iterator 分页读取主键、逐页删除，客户端内存只与页大小有关
         - flush 确保落盘
         返回：
-        - None（成功时无返回），若集合不存在抛 ValueError
+        - 删除前的记录数（num_entities，可能包含尚未 compaction 的已删除记录，仅供参考）
+        - 若集合不存在抛 ValueError
         """
         name = collection_name or self.collection_name
-        if not utility.has_collection(name):
+        collection = self._collection_handle(name)
+        if collection is None:
             raise ValueError(f"集合 '{name}' 不存在")
 
-        collection = Collection(name)
-        collection.load()
-        results = collection.query(expr="id >= 0", output_fields=[self.settings.id_field])
-        if not results:
+        num_entities = collection.num_entities
+        if num_entities == 0:
             logger.info("集合 %s 已为空", name)
-            return
+            return 0
 
-        ids = [doc[self.settings.id_field] for doc in results]
-        expr = f"{self.settings.id_field} in [{','.join(map(str, ids))}]"
-        collection.delete(expr=expr)
-        collection.flush()
-        logger.info("已清空集合 %s，删除 %d 条记录", name, len(ids))
+        # 范围表达式删除需要集合处于已加载状态
+        self._ensure_loaded(collection)
+        try:
+            collection.delete(expr=self._id_all_expr)
+        except MilvusException as exc:
+            # 只有服务端明确拒绝该表达式时才退回分页删除，限流、未加载、断连等错误直接抛出
+            if not self._expr_rejected(exc, self._id_all_expr):
+                raise
+            logger.warning("服务端不支持范围表达式删除（%s），改为分页删除", exc)
+            self._delete_paged(collection)
+        self._flush(collection)
+        self._id_filters.pop(name, None)
+        logger.info("已清空集合 %s，删除约 %d 条记录", name, num_entities)
+        return num_entities
+
+    def _delete_paged(self, collection: Collection):
+        """按 _SCAN_BATCH 分页读取主键，每页按 _IN_EXPR_CHUNK 分片以 "id in ..." 条件删除。"""
+        total = 0
+        for ids in self._scan_ids(collection):
+            for start in range(0, len(ids), _IN_EXPR_CHUNK):
+                self._call_with_ids(collection.delete, ids[start:start + _IN_EXPR_CHUNK])
+            total += len(ids)
+        logger.debug("分页删除 %d 条记录", total)
 
     # -------------------- 数据操作 -------------------- #
-    def insert_documents(self, texts: List[str], embeddings: List[List[float]]):
+    def insert_documents(
+        self,
+        texts: List[str],
+        embeddings: Union[List[List[float]], np.ndarray],
+        flush: bool = False,
+        ids: Optional[List[int]] = None,
+    ):
         """
         插入文本与向量。
 
         约束：
         - texts 与 embeddings 长度必须一致
         - embeddings 维度需与集合 schema 一致（由调用方保证）
+        - auto_id=False 时必须通过 ids 显式传入主键；auto_id=True 时不能传 ids
         流程：
-        - get_collection -> insert -> flush
+        - get_collection -> 按 settings.insert_batch_size 分批 insert（-> flush，仅当 flush=True）
+        说明：
+        - embeddings 会先转为连续的 float32 数组，PyMilvus 可整块序列化，避免逐个 Python float 转换
+        - 超过一批时经 ThreadPoolExecutor 保持 settings.insert_concurrency 个 insert 同时在途：
+          单请求过大会拖慢服务端写入流水线，串行小请求又浪费 RPC 往返，适中的批大小 + 少量并发吞吐最高
+        - 无论分多少批，flush 至多在最后执行一次；flush 会强制 seal segment，
+          批量导入时应在全部插入完成后调用一次 self.flush()
         返回：
-        - None，异常向上抛出
+        - None，任一批失败时异常向上抛出
         """
         if len(texts) != len(embeddings):
             raise ValueError("文本和向量数量必须一致")
 
         collection = self.get_collection()
-        entities = [texts, embeddings]
-        collection.insert(entities)
-        collection.flush()
+        vectors = self._as_vectors(embeddings)
+        batch_size = max(1, self.settings.insert_batch_size)
+        if len(texts) <= batch_size:
+            result = collection.insert(self._build_entities(texts, vectors, ids))
+            self._remember_ids(result.primary_keys)
+        else:
+            self._build_entities(texts, vectors, ids)  # 提前校验 ids 与 auto_id 配置是否匹配
+
+            def _insert(start: int):
+                end = start + batch_size
+                chunk_ids = ids[start:end] if ids is not None else None
+                return collection.insert(self._build_entities(texts[start:end], vectors[start:end], chunk_ids))
+
+            starts = range(0, len(texts), batch_size)
+            workers = max(1, min(self.settings.insert_concurrency, len(starts)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for result in list(pool.map(_insert, starts)):
+                    self._remember_ids(result.primary_keys)
+        if flush:
+            self._flush(collection)
         logger.info("已插入 %d 条文档", len(texts))
 
-    def delete_document(self, doc_id: int):
+    def insert_documents_iter(
+        self,
+        pairs: Iterable[Tuple[str, Union[List[float], np.ndarray]]],
+        batch_size: int = 1000,
+    ) -> Iterator[int]:
+        """
+        流式分批插入（生成器）：适合内存装不下的大语料。
+
+        - 从 pairs 中逐条读取 (text, embedding)，攒满 batch_size 条就组装成 float32 矩阵插入一次，
+          内存峰值与单条 gRPC 消息大小都只与 batch_size 有关
+        - 每插入一批 yield 该批条数；迭代结束后 flush 一次
+        - 主键由 Milvus 自动生成（auto_id=False 的集合请使用 insert_documents 并显式传 ids）
+        """
         collection = self.get_collection()
-        collection.delete(expr=f"{self.settings.id_field} == {doc_id}")
+        texts: List[str] = []
+        vectors: List[Union[List[float], np.ndarray]] = []
+        for text, embedding in pairs:
+            texts.append(text)
+            vectors.append(embedding)
+            if len(texts) >= batch_size:
+                yield self._insert_batch(collection, texts, vectors)
+                texts, vectors = [], []
+        if texts:
+            yield self._insert_batch(collection, texts, vectors)
+        self._flush(collection)
+
+    def _insert_batch(self, collection: Collection, texts: List[str], vectors: List[Any]) -> int:
+        entities = self._build_entities(texts, self._as_vectors(vectors), None)
+        result = collection.insert(entities)
+        self._remember_ids(result.primary_keys)
+        logger.debug("已插入一批 %d 条文档", len(texts))
+        return len(texts)
+
+    def insert_documents_parallel(
+        self,
+        texts: List[str],
+        embeddings: Union[List[List[float]], np.ndarray],
+        n_workers: int = 4,
+        chunk_size: int = 2048,
+        ids: Optional[List[int]] = None,
+    ):
+        """
+        并行批量插入（大规模导入场景）。
+
+        做法：
+        - 按 chunk_size 切分 texts / embeddings
+        - 每个 worker 使用独立的连接和 Collection 句柄，经 ThreadPoolExecutor 并发 insert
+          （gRPC I/O 期间会释放 GIL，客户端的 protobuf 打包可以与网络传输重叠）
+        - 优先复用连接池（settings.channel_pool_size）中已建立的连接，不足 n_workers 时才额外建连
+        - 全部完成后只 flush 一次
+        返回：
+        - None，任一分片失败时异常向上抛出
+        """
+        if len(texts) != len(embeddings):
+            raise ValueError("文本和向量数量必须一致")
+        if not texts:
+            return
+
+        self.get_collection()  # 确认集合存在（同时建立连接池上的句柄缓存）
+        vectors = self._as_vectors(embeddings)
+        self._build_entities(texts, vectors, ids)  # 提前校验 ids 与 auto_id 配置是否匹配
+        bounds = list(range(0, len(texts), chunk_size))
+        handles = self._worker_handles(min(n_workers, len(bounds)))
+
+        def _insert(job):
+            idx, start = job
+            end = start + chunk_size
+            chunk_ids = ids[start:end] if ids is not None else None
+            entities = self._build_entities(texts[start:end], vectors[start:end], chunk_ids)
+            return handles[idx % len(handles)].insert(entities).primary_keys
+
+        with ThreadPoolExecutor(max_workers=len(handles)) as pool:
+            # list() 触发迭代，使工作线程中的异常在此处抛出
+            for primary_keys in list(pool.map(_insert, enumerate(bounds))):
+                self._remember_ids(primary_keys)
+
+        self._flush(handles[0])
+        logger.info("已并行插入 %d 条文档（%d 个分片，%d 个连接）", len(texts), len(bounds), len(handles))
+
+    def _worker_handles(self, n_workers: int) -> List[Collection]:
+        """并行写入用的 Collection 句柄：先取连接池上缓存的句柄，不够时再建立额外的写入连接。"""
+        handles = list(self._collections[self.collection_name][:n_workers])
+        extra = n_workers - len(handles)
+        if extra > 0:
+            handles += [
+                Collection(self.collection_name, using=alias)
+                for alias in self._ensure_worker_connections(extra)
+            ]
+        return handles
+
+    def _ensure_worker_connections(self, n_workers: int) -> List[str]:
+        """按需建立 n_workers 个并行写入连接，返回其别名列表。"""
+        while len(self._worker_aliases) < n_workers:
+            alias = f"{self.connection_name}_w{len(self._worker_aliases)}"
+            _connect_alias(alias, self.settings.host, self.settings.port)
+            self._worker_aliases.append(alias)
+        return self._worker_aliases[:n_workers]
+
+    def start_writer(self, batch_bytes: int = 32 << 20, max_pending: int = 10000):
+        """
+        启动后台写入线程（insertion buffer 模式）。
+
+        - 调用方通过 stage() 投递单条数据后立即返回，向量化与网络写入得以重叠
+        - 后台线程累积到约 batch_bytes（默认 32MB，Milvus 建议单次插入 20~40MB）后批量 insert
+        - max_pending 限制队列长度，生产者过快时 stage() 会阻塞，内存有上界
+        - 结束时调用 close_writer() 写完剩余数据并 flush 一次
+        """
+        if self._writer is not None:
+            return
+        collection = self.get_collection()
+        self._write_queue = queue.Queue(maxsize=max_pending)
+        self._writer_error = None
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            args=(collection, batch_bytes),
+            name="milvus-writer",
+            daemon=True,
+        )
+        self._writer.start()
+
+    def stage(self, text: str, embedding: Union[List[float], np.ndarray], doc_id: Optional[int] = None):
+        """投递一条待写入数据（auto_id=False 时需提供 doc_id），后台线程写入失败时在此抛出。"""
+        if self._writer is None:
+            raise RuntimeError("写入线程未启动，请先调用 start_writer()")
+        if self._writer_error is not None:
+            raise self._writer_error
+        self._write_queue.put((text, embedding, doc_id))
+
+    def close_writer(self):
+        """写完队列中的剩余数据、停止后台线程并 flush 一次。"""
+        if self._writer is None:
+            return
+        self._write_queue.put(_WRITER_STOP)
+        self._writer.join()
+        self._writer = None
+        if self._writer_error is not None:
+            raise self._writer_error
+        self.flush()
+
+    def _writer_loop(self, collection: Collection, batch_bytes: int):
+        texts: List[str] = []
+        vectors: List[Any] = []
+        ids: List[Optional[int]] = []
+        pending_bytes = 0
+        while True:
+            item = self._write_queue.get()
+            stop = item is _WRITER_STOP
+            if not stop:
+                text, embedding, doc_id = item
+                texts.append(text)
+                vectors.append(embedding)
+                ids.append(doc_id)
+                pending_bytes += len(text.encode("utf-8")) + len(embedding) * 4
+            if texts and (stop or pending_bytes >= batch_bytes):
+                # 出错后继续消费队列（丢弃数据），避免生产者阻塞；错误在 stage/close_writer 中抛出
+                if self._writer_error is None:
+                    try:
+                        entities = self._build_entities(
+                            texts,
+                            self._as_vectors(vectors),
+                            None if self.settings.auto_id else ids,
+                        )
+                        self._remember_ids(collection.insert(entities).primary_keys)
+                        logger.debug("后台写入 %d 条文档", len(texts))
+                    except Exception as exc:
+                        logger.error("后台写入失败: %s", exc)
+                        self._writer_error = exc
+                texts, vectors, ids, pending_bytes = [], [], [], 0
+            if stop:
+                return
+
+    def _as_vectors(self, embeddings: Union[List[List[float]], List[np.ndarray], np.ndarray]) -> np.ndarray:
+        """
+        把向量统一转为 (N, dim) 的 C 连续数组（dtype 由 settings.vector_dtype 决定），每条写入/检索路径只转换一次。
+
+        已是目标 dtype 的连续数组时不复制；PyMilvus 对连续数组整列序列化，不再逐个转换 Python float。
+        """
+        vectors = np.ascontiguousarray(embeddings, dtype=self._vector_np_dtype)
+        if vectors.ndim != 2:
+            raise ValueError(f"向量须为 (N, dim) 的二维数组，实际形状为 {vectors.shape}")
+        return vectors
+
+    def _build_entities(self, texts: List[str], vectors: np.ndarray, ids: Optional[List[int]]) -> List[Any]:
+        """按 schema 字段顺序组装列式数据：auto_id=False 时首列为主键。"""
+        if self.settings.auto_id:
+            if ids is not None:
+                raise ValueError("auto_id=True 时不能显式指定 ids")
+            return [texts, vectors]
+        if ids is None or len(ids) != len(texts):
+            raise ValueError("auto_id=False 时必须为每条文本提供 ids")
+        return [ids, texts, vectors]
+
+    def flush(self):
+        """将当前集合的写入落盘（seal segment），批量写入结束后调用一次即可。"""
+        self._flush(self.get_collection())
+
+    def _flush(self, collection: Collection):
+        """所有 flush 的唯一出口：flush 后 num_entities 才会反映新写入的数据，同时使统计缓存失效。"""
         collection.flush()
+        self._stats_cache.pop(collection.name, None)
+
+    def delete_document(self, doc_id: int, flush: bool = False):
+        """
+        删除单条文档。
+
+        - 默认不 flush：delete 写入 WAL 后即生效，seal segment 留给批量操作结束时统一处理；
+          需要立即对强一致性读可见时传 flush=True，或检索时使用 consistency_level="Strong"
+        """
+        if not self._filter_known_ids([doc_id]):
+            logger.info("文档 ID %s 不存在，跳过删除", doc_id)
+            return
+        collection = self.get_collection()
+        collection.delete(expr=self._id_eq_prefix + str(doc_id))
+        if flush:
+            self._flush(collection)
         logger.info("已删除文档 ID: %s", doc_id)
 
-    def delete_documents(self, doc_ids: List[int]):
+    def delete_documents(self, doc_ids: List[int], flush: bool = False):
+        """批量删除（主键分片并发提交）；flush=True 时在所有分片完成后 flush 一次。"""
+        doc_ids = self._filter_known_ids(doc_ids)
         if not doc_ids:
             return
-        collection = self.get_collection()
-        expr = f"{self.settings.id_field} in [{','.join(map(str, doc_ids))}]"
-        collection.delete(expr=expr)
-        collection.flush()
+        self._map_id_chunks(lambda col, chunk: self._call_with_ids(col.delete, chunk), doc_ids)
+        if flush:
+            self._flush(self.get_collection())
         logger.info("已批量删除 %d 条文档", len(doc_ids))
 
-    def update_document(self, doc_id: int, text: str, embedding: List[float]):
+    def update_document(
+        self,
+        doc_id: int,
+        text: str,
+        embedding: Union[List[float], np.ndarray],
+        flush: bool = False,
+    ):
         """
-        更新文档：当前 schema 使用 auto_id=True，因此采取“删除+插入”模式。
+        更新文档。
 
-        影响：
-        - 新记录会生成新的 ID（auto_id=True 的特性）
-        - 如果需要保持 ID 不变，需改 schema 为 auto_id=False 并在插入时显式传 ID。
-        流程：
-        - 检查存在 -> delete 原记录 -> flush -> insert 新记录 -> flush
+        - auto_id=False：单次 upsert RPC 原地替换，ID 保持不变
+        - auto_id=True：主键由 Milvus 生成，无法 upsert，只能“删除+插入”，新记录会得到新的 ID
+        流程（auto_id=True）：
+        - delete 原记录（由 delete_count 判断是否存在，无需额外 query）-> insert 新记录
+        - 新旧记录主键不同，两步之间无需 flush；flush=True 时在最后 flush 一次
         返回：
-        - None，若文档不存在抛 ValueError，其他异常由 PyMilvus 抛出
+        - None，auto_id=True 下若文档不存在抛 ValueError，其他异常由 PyMilvus 抛出
         """
-        # 确认存在
-        existing = self.get_document(doc_id)
-        if not existing:
-            raise ValueError(f"文档 {doc_id} 不存在")
+        vector = self._as_vectors(np.reshape(embedding, (1, -1)))
+        if not self.settings.auto_id:
+            collection = self.get_collection()
+            collection.upsert(self._build_entities([text], vector, [doc_id]))
+            self._remember_ids([doc_id])
+            if flush:
+                self._flush(collection)
+            logger.info("已更新文档 ID: %s", doc_id)
+            return
 
         collection = self.get_collection()
-        collection.delete(expr=f"{self.settings.id_field} == {doc_id}")
-        collection.flush()
+        result = collection.delete(expr=self._id_eq_prefix + str(doc_id))
+        if result.delete_count == 0:
+            raise ValueError(f"文档 {doc_id} 不存在")
 
-        entities = [[text], [embedding]]
-        collection.insert(entities)
-        collection.flush()
+        entities = self._build_entities([text], vector, None)
+        result = collection.insert(entities)
+        self._remember_ids(result.primary_keys)
+        if flush:
+            self._flush(collection)
         logger.info("已更新文档（原 ID: %s，auto_id 会产生新 ID）", doc_id)
 
     def get_document(self, doc_id: int) -> Optional[Dict[str, Any]]:
-        collection = self.get_collection()
-        collection.load()
-        results = collection.query(
-            expr=f"{self.settings.id_field} == {doc_id}",
-            output_fields=[self.settings.id_field, self.settings.text_field, self.settings.anns_field],
+        collection = self.get_collection(load=True)
+        results = self._query_ids(
+            collection,
+            [doc_id],
+            [self.settings.id_field, self.settings.text_field, self.settings.anns_field],
         )
-        return results[0] if results else None
+        return self._vectors_to_numpy(results)[0] if results else None
 
     def query_by_ids(self, doc_ids: List[int]) -> List[Dict[str, Any]]:
+        doc_ids = self._filter_known_ids(doc_ids)
         if not doc_ids:
             return []
-        collection = self.get_collection()
-        collection.load()
-        expr = f"{self.settings.id_field} in [{','.join(map(str, doc_ids))}]"
-        return collection.query(
-            expr=expr,
-            output_fields=[self.settings.id_field, self.settings.text_field, self.settings.anns_field],
+        self.get_collection(load=True)
+        output_fields = [self.settings.id_field, self.settings.text_field, self.settings.anns_field]
+        results: List[Dict[str, Any]] = []
+        for rows in self._map_id_chunks(lambda col, chunk: self._query_ids(col, chunk, output_fields), doc_ids):
+            results.extend(rows)
+        return self._vectors_to_numpy(results)
+
+    def _query_ids(self, collection: Collection, ids: List[int], output_fields: List[str]) -> List[Dict[str, Any]]:
+        """按主键查询（主键 in 条件在服务端走主键索引）。"""
+        return self._call_with_ids(collection.query, ids, output_fields=output_fields)
+
+    @staticmethod
+    def _expr_rejected(exc: MilvusException, expr: str) -> bool:
+        """
+        服务端是否因无法解析 / 不支持表达式 expr 本身而拒绝请求。
+
+        要求错误码为参数非法且错误信息中带有该表达式（服务端的解析错误会回显原表达式），
+        限流、集合未加载、连接断开以及其他表达式引起的错误都不算。
+        """
+        if exc.code != _PARAMETER_INVALID and exc.compatible_code != _LEGACY_ILLEGAL_ARGUMENT:
+            return False
+        return expr in (exc.message or "")
+
+    def _call_with_ids(self, method, ids: List[int], **kwargs) -> Any:
+        """
+        以 "id in ..." 条件调用 collection.query / collection.delete。
+
+        优先使用表达式模板 "id in {ids}"：主键列表作为 expr_params 以 protobuf int64 数组传输，
+        省去客户端拼接长字符串与服务端解析字面量；只有服务端报告无法解析模板时（Milvus < 2.5）
+        才改用 "id in [...]" 字面量表达式并不再尝试模板，限流、集合未加载等其他错误照常抛出。
+        """
+        if self._expr_templates:
+            try:
+                return method(expr=self._id_in_template, expr_params={"ids": [int(doc_id) for doc_id in ids]}, **kwargs)
+            except MilvusException as exc:
+                if not self._expr_rejected(exc, self._id_in_template):
+                    raise
+                with self._expr_templates_lock:
+                    if self._expr_templates:
+                        logger.info("服务端不支持表达式模板（%s），改用字面量表达式", exc)
+                        self._expr_templates = False
+        return method(expr=self._id_in_prefix + ",".join(map(str, ids)) + "]", **kwargs)
+
+    def _vectors_to_numpy(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        将查询结果中的向量字段转为 float32 ndarray（比 Python float 列表省内存，且可直接参与 NumPy 运算）。
+
+        FLOAT16_VECTOR 字段以原始字节返回，按 float16 解码后再转为 float32。
+        """
+        field = self.settings.anns_field
+        for row in rows:
+            if field in row:
+                value = row[field]
+                if isinstance(value, list) and value and isinstance(value[0], bytes):
+                    value = b"".join(value)
+                if isinstance(value, bytes):
+                    value = np.frombuffer(value, dtype=self._vector_np_dtype)
+                row[field] = np.asarray(value, dtype=np.float32)
+        return rows
+
+    def _id_filter(self) -> Optional[BlockedBloomFilter]:
+        """
+        返回当前集合的主键 Bloom 过滤器（未开启 settings.id_filter 时返回 None）。
+
+        首次使用时以强一致性分批扫描一次全部主键构建，之后由写路径增量维护。
+        """
+        if not self.settings.id_filter:
+            return None
+        bloom = self._id_filters.get(self.collection_name)
+        if bloom is None:
+            bloom = BlockedBloomFilter(self.settings.id_filter_capacity)
+            for batch in self._scan_ids(self.get_collection(load=True)):
+                bloom.add_many(batch)
+            self._id_filters[self.collection_name] = bloom
+        return bloom
+
+    def _scan_ids(self, collection: Collection, batch_size: int = _SCAN_BATCH) -> Iterator[List[int]]:
+        """
+        用 query_iterator 分批读取集合内全部主键，每次 yield 一批。
+
+        单次 query 会把全部主键一次性物化（且受服务端单次结果数上限限制），
+        分批迭代时客户端只保留当前一批。
+        """
+        iterator = collection.query_iterator(
+            batch_size=batch_size,
+            expr=self._id_all_expr,
+            output_fields=[self.settings.id_field],
+            consistency_level="Strong",
         )
+        id_field = self.settings.id_field
+        try:
+            while True:
+                rows = iterator.next()
+                if not rows:
+                    return
+                yield [row[id_field] for row in rows]
+        finally:
+            iterator.close()
+
+    def _remember_ids(self, primary_keys: List[int]):
+        """写入成功后把主键加入过滤器（过滤器尚未构建时无需处理，构建时会全量扫描）。"""
+        bloom = self._id_filters.get(self.collection_name)
+        if bloom is not None:
+            bloom.add_many(primary_keys)
+
+    def _filter_known_ids(self, ids: List[int]) -> List[int]:
+        """剔除一定不存在的主键；未开启过滤器时原样返回。"""
+        bloom = self._id_filter()
+        if bloom is None or not ids:
+            return list(ids)
+        return [doc_id for doc_id, hit in zip(ids, bloom.contains_many(ids)) if hit]
+
+    def _map_id_chunks(self, fn, ids: List[int]) -> List[Any]:
+        """
+        对主键按 _IN_EXPR_CHUNK 分片，逐片调用 fn(collection, chunk)，按分片顺序返回结果列表。
+
+        只有一片时直接在当前线程执行；多片时经 ThreadPoolExecutor 并发提交，
+        启用连接池时各分片的 Collection 句柄在池连接间轮询。
+        """
+        chunks = [ids[start:start + _IN_EXPR_CHUNK] for start in range(0, len(ids), _IN_EXPR_CHUNK)]
+        if len(chunks) == 1:
+            return [fn(self.get_collection(), chunks[0])]
+        with ThreadPoolExecutor(max_workers=min(_IN_EXPR_WORKERS, len(chunks))) as pool:
+            return list(pool.map(lambda chunk: fn(self.get_collection(), chunk), chunks))
 
     # -------------------- 搜索与统计 -------------------- #
-    def search(self, query_embedding: List[float], top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    def search(
+        self,
+        query_embedding: Union[List[float], np.ndarray],
+        top_k: Optional[int] = None,
+        consistency_level: Optional[str] = None,
+        fetch_text: bool = True,
+    ) -> SearchBatch:
         """
-        向量搜索，返回格式化后的结果列表。
+        单条向量搜索，返回列式结果 SearchBatch（search_batch 的单条包装）。
 
-        - params 来自 settings.search_params()，默认 metric=L2，nprobe 可配置。
-        - 输出字段仅 text（可按需扩展）。
-        - score 为简单的 1/(1+distance) 近似相似度。
         参数：
         - query_embedding：单条查询向量
-        - top_k：返回条数，默认取 settings.top_k_default
+        - top_k / consistency_level / fetch_text：同 search_batch
         返回：
-        - List[dict]，含 id/text/distance/score
+        - SearchBatch（ids/distances/scores/texts），需要 List[dict] 时调用 to_dicts()
         """
-        collection = self.get_collection()
-        collection.load()
-        params = self.settings.search_params()
+        return self.search_batch(
+            self._as_vectors(np.reshape(query_embedding, (1, -1))),
+            top_k=top_k,
+            consistency_level=consistency_level,
+            fetch_text=fetch_text,
+        )[0]
+
+    def search_batch(
+        self,
+        query_embeddings: Union[List[List[float]], np.ndarray],
+        top_k: Optional[int] = None,
+        consistency_level: Optional[str] = None,
+        fetch_text: bool = True,
+    ) -> List[SearchBatch]:
+        """
+        批量向量搜索：多条查询向量在一次 RPC 中提交，由服务端一起检索。
+
+        - params 来自 settings.search_params()（构造时缓存），默认 metric=IP，nprobe/ef 可配置。
+        - 输出字段仅 text（可按需扩展）；fetch_text=False 时不返回任何标量字段，
+          响应只含 id + distance，texts 全为 None，需要时再用 hydrate() 取回文本。
+        - score：IP/COSINE 下直接取服务端返回的相似度；L2 下为 1/(1+distance) 近似相似度。
+        参数：
+        - query_embeddings：查询向量列表或 (N, dim) 数组
+        - top_k：每条查询返回条数，默认取 settings.top_k_default
+        - consistency_level：一致性级别，默认沿用集合设置；需要读到刚写入（未 flush）的数据时传 "Strong"
+        - fetch_text：是否随命中返回文本（text 最长 max_length 字符，命中多时是响应体积的大头）
+        返回：
+        - List[SearchBatch]，与 query_embeddings 一一对应
+        """
+        if len(query_embeddings) == 0:
+            return []
+        collection = self.get_collection(load=True)
         k = top_k or self.settings.top_k_default
+        kwargs = {"consistency_level": consistency_level} if consistency_level else {}
 
         results = collection.search(
-            data=[query_embedding],
+            # 查询向量的 dtype 必须与向量字段一致（float16 字段用 float16 占位符）
+            data=self._as_vectors(query_embeddings),
             anns_field=self.settings.anns_field,
-            param=params,
+            param=self._search_params,
             limit=k,
-            output_fields=[self.settings.text_field],
+            output_fields=[self.settings.text_field] if fetch_text else [],
+            **kwargs,
         )
+        return [self._to_search_batch(hits, fetch_text) for hits in results]
+
+    def hydrate(self, ids: Iterable[int]) -> Dict[int, str]:
+        """
+        按主键批量取回文本（两阶段检索的第二步），返回 id -> text。
+
+        只请求 id / text 两个字段（不带向量），主键分片并发查询；已不存在的主键不出现在结果中。
+        """
+        ids = list(ids)
+        if not ids:
+            return {}
+        self.get_collection(load=True)
+        id_field, text_field = self.settings.id_field, self.settings.text_field
+        texts: Dict[int, str] = {}
+        for rows in self._map_id_chunks(lambda col, chunk: self._query_ids(col, chunk, [id_field, text_field]), ids):
+            for row in rows:
+                texts[row[id_field]] = row[text_field]
+        return texts
+
+    def _to_search_batch(self, hits, fetch_text: bool = True) -> SearchBatch:
+        """把一条查询的命中转为 SearchBatch：距离一次性收集为数组，score 用向量化运算得到，不逐条做 Python 除法。"""
+        n = len(hits)
+        dists = np.fromiter((hit.distance for hit in hits), dtype=np.float64, count=n)
+        similarity = self._similarity
+        if n >= _KERNEL_MIN_HITS:
+            # 大 top_k（批量重排等）时使用 JIT 内核；模块只在这里按需导入，避免拖慢普通检索与 CLI 启动
+            from ._numba_kernels import distances_to_scores
 
-        formatted: List[Dict[str, Any]] = []
-        for hits in results:
-            for hit in hits:
-                formatted.append(
-                    {
-                        "id": hit.id,
-                        "text": hit.entity.get(self.settings.text_field),
-                        "distance": hit.distance,
-                        "score": 1 / (1 + hit.distance),
-                    }
-                )
-        return formatted
+            scores = distances_to_scores(dists, similarity)
+        else:
+            # IP / COSINE 下服务端返回的就是相似度，无需再做换算；复制一份，
+            # 避免 scores 与 distances 共用同一数组，调用方原地修改 scores 时不会改动 distances
+            scores = dists.copy() if similarity else 1.0 / (1.0 + dists)
+        text_field = self.settings.text_field
+        return SearchBatch(
+            ids=np.fromiter((hit.id for hit in hits), dtype=np.int64, count=n),
+            distances=dists,
+            scores=scores,
+            texts=[hit.entity.get(text_field) for hit in hits] if fetch_text else [None] * n,
+        )
 
     def get_collection_stats(self) -> Dict[str, Any]:
         """
         返回集合名与实体数量，便于快速查看数据规模。
+
+        - num_entities 来自 GetCollectionStatistics 元数据 RPC，不需要 load 集合
+        - 结果按集合名缓存 settings.stats_ttl_s 秒，轮询场景下 RPC 次数与轮询频率无关；
+          本客户端 flush / clear / drop 时主动失效
         返回：
         - dict: {"collection_name": str, "num_entities": int}
         """
-        collection = self.get_collection()
-        collection.load()
+        name = self.collection_name
+        cached = self._stats_cache.get(name)
+        now = time.monotonic()
+        if cached is None or now - cached[0] >= self.settings.stats_ttl_s:
+            cached = (now, self.get_collection().num_entities)
+            self._stats_cache[name] = cached
         return {
-            "collection_name": self.collection_name,
-            "num_entities": collection.num_entities,
+            "collection_name": name,
+            "num_entities": cached[1],
         }
 
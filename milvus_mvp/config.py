@@ -24,13 +24,31 @@ class MilvusSettings:
         dimension: 向量维度，默认为 384，可通过 MILVUS_DIMENSION 配置
         max_length: 单条数据最大长度，默认为 5000，可通过 MILVUS_MAX_LENGTH 配置
 
-        metric_type: 相似度度量方式，默认为 L2（欧式距离），可通过 MILVUS_METRIC 配置
-        index_type: 索引类型，默认为 IVF_FLAT，可通过 MILVUS_INDEX_TYPE 配置
-        index_nlist: 索引 nlist 参数，默认为 128，可通过 MILVUS_INDEX_NLIST 配置
-        search_nprobe: 搜索 nprobe 参数，默认为 10，可通过 MILVUS_SEARCH_NPROBE 配置
+        metric_type: 相似度度量方式，默认为 IP（内积，配合归一化向量即余弦相似度），可通过 MILVUS_METRIC 配置
+        index_type: 索引类型，默认为 IVF_SQ8（int8 标量量化，内存约为 FLAT 的 1/4），可通过 MILVUS_INDEX_TYPE 配置
+        index_nlist: IVF 类索引 nlist 参数，默认为 128，可通过 MILVUS_INDEX_NLIST 配置
+        search_nprobe: IVF 类索引搜索 nprobe 参数，默认为 10，可通过 MILVUS_SEARCH_NPROBE 配置
+        hnsw_m: HNSW 索引 M 参数，默认为 16，可通过 MILVUS_HNSW_M 配置
+        hnsw_ef_construction: HNSW 索引 efConstruction 参数，默认为 200，可通过 MILVUS_HNSW_EF_CONSTRUCTION 配置
+        search_ef: HNSW 搜索 ef 参数，默认为 64，可通过 MILVUS_SEARCH_EF 配置
 
+        vector_dtype: 向量字段的元素类型，float32（默认）或 float16，可通过 MILVUS_VECTOR_DTYPE 配置；
+            float16 时集合使用 FLOAT16_VECTOR 字段，插入/检索传输的向量字节数与服务端向量内存减半（需 Milvus >= 2.4）
+        channel_pool_size: 连接池大小（gRPC 通道数），默认为 1，可通过 MILVUS_CHANNEL_POOL_SIZE 配置；
+            并发检索/写入时调大，请求会轮询分布到多个独立连接上
+        insert_batch_size: insert_documents 单次 insert RPC 的最大条数，默认为 256，可通过 MILVUS_INSERT_BATCH_SIZE 配置
+        insert_concurrency: insert_documents 同时在途的 insert RPC 数，默认为 2，可通过 MILVUS_INSERT_CONCURRENCY 配置
+        stats_ttl_s: get_collection_stats 结果的客户端缓存时间（秒），默认为 5，可通过 MILVUS_STATS_TTL 配置（0 表示不缓存）
+        warmup_on_connect: connect 后是否在后台线程预热集合（load + 一次 limit=1 的检索，把向量数据拉入缓存），
+            默认为 false（短生命周期的 CLI 无需预热），可通过 MILVUS_WARMUP_ON_CONNECT 配置；常驻服务建议开启
         top_k_default: 默认检索 topK 数量，默认为 5，可通过 MILVUS_TOPK 配置
         auto_id: 是否使用 Milvus 自动生成主键，默认为 true，可通过 MILVUS_AUTO_ID 配置
+        id_filter: 是否在客户端维护主键 Bloom 过滤器，用于跳过一定不存在的 ID 的 delete/query，默认为 false，可通过 MILVUS_ID_FILTER 配置
+        id_filter_capacity: 主键过滤器的预期容量，默认为 1000000，可通过 MILVUS_ID_FILTER_CAPACITY 配置
+        model_name: sentence-transformers 向量化模型名称，默认为 all-MiniLM-L6-v2（384 维），可通过 MILVUS_MODEL_NAME 配置
+        normalize: 编码时是否对向量做 L2 归一化，默认为 true，可通过 MILVUS_NORMALIZE 配置；
+            归一化后 IP 即余弦相似度，无需使用带开方的 L2 度量
+        embedding_cache_dir: 向量持久化缓存目录，默认为 .emb_cache，可通过 MILVUS_EMB_CACHE_DIR 配置（置空则禁用）
 
         anns_field: 用于存储 embedding 的字段名
         text_field: 用于存储文本的字段名
@@ -49,18 +67,52 @@ class MilvusSettings:
     max_length: int = field(default_factory=lambda: int(_get_env("MILVUS_MAX_LENGTH", "5000")))
 
     # 相似度度量类型，通过环境变量覆盖
-    metric_type: str = field(default_factory=lambda: _get_env("MILVUS_METRIC", "L2"))
+    metric_type: str = field(default_factory=lambda: _get_env("MILVUS_METRIC", "IP"))
     # 索引类型，通过环境变量覆盖
-    index_type: str = field(default_factory=lambda: _get_env("MILVUS_INDEX_TYPE", "IVF_FLAT"))
+    index_type: str = field(default_factory=lambda: _get_env("MILVUS_INDEX_TYPE", "IVF_SQ8"))
     # nlist 参数，通过环境变量覆盖
     index_nlist: int = field(default_factory=lambda: int(_get_env("MILVUS_INDEX_NLIST", "128")))
     # nprobe 参数，通过环境变量覆盖
     search_nprobe: int = field(default_factory=lambda: int(_get_env("MILVUS_SEARCH_NPROBE", "10")))
+    # HNSW M 参数，通过环境变量覆盖
+    hnsw_m: int = field(default_factory=lambda: int(_get_env("MILVUS_HNSW_M", "16")))
+    # HNSW efConstruction 参数，通过环境变量覆盖
+    hnsw_ef_construction: int = field(default_factory=lambda: int(_get_env("MILVUS_HNSW_EF_CONSTRUCTION", "200")))
+    # HNSW 搜索 ef 参数，通过环境变量覆盖
+    search_ef: int = field(default_factory=lambda: int(_get_env("MILVUS_SEARCH_EF", "64")))
+
+    # 向量元素类型，通过环境变量覆盖 ("float32"/"float16")
+    vector_dtype: str = field(default_factory=lambda: _get_env("MILVUS_VECTOR_DTYPE", "float32"))
+
+    # 连接池大小，通过环境变量覆盖
+    channel_pool_size: int = field(default_factory=lambda: int(_get_env("MILVUS_CHANNEL_POOL_SIZE", "1")))
+    # 单次 insert 的最大条数，通过环境变量覆盖
+    insert_batch_size: int = field(default_factory=lambda: int(_get_env("MILVUS_INSERT_BATCH_SIZE", "256")))
+    # 同时在途的 insert 请求数，通过环境变量覆盖
+    insert_concurrency: int = field(default_factory=lambda: int(_get_env("MILVUS_INSERT_CONCURRENCY", "2")))
+
+    # 集合统计缓存时间（秒），通过环境变量覆盖
+    stats_ttl_s: float = field(default_factory=lambda: float(_get_env("MILVUS_STATS_TTL", "5")))
+
+    # connect 后是否后台预热，通过环境变量覆盖 ("true"/"false")
+    warmup_on_connect: bool = field(
+        default_factory=lambda: _get_env("MILVUS_WARMUP_ON_CONNECT", "false").lower() == "true"
+    )
 
     # top_k 默认值，通过环境变量覆盖
     top_k_default: int = field(default_factory=lambda: int(_get_env("MILVUS_TOPK", "5")))
     # 是否自动生成 ID，通过环境变量覆盖 ("true"/"false")
     auto_id: bool = field(default_factory=lambda: _get_env("MILVUS_AUTO_ID", "true").lower() == "true")
+    # 是否启用主键 Bloom 过滤器，通过环境变量覆盖 ("true"/"false")
+    id_filter: bool = field(default_factory=lambda: _get_env("MILVUS_ID_FILTER", "false").lower() == "true")
+    # 主键过滤器预期容量，通过环境变量覆盖
+    id_filter_capacity: int = field(default_factory=lambda: int(_get_env("MILVUS_ID_FILTER_CAPACITY", "1000000")))
+    # 向量化模型名称，通过环境变量覆盖
+    model_name: str = field(default_factory=lambda: _get_env("MILVUS_MODEL_NAME", "all-MiniLM-L6-v2"))
+    # 是否归一化向量，通过环境变量覆盖 ("true"/"false")
+    normalize: bool = field(default_factory=lambda: _get_env("MILVUS_NORMALIZE", "true").lower() == "true")
+    # 向量缓存目录，通过环境变量覆盖（空字符串表示不启用缓存）
+    embedding_cache_dir: str = field(default_factory=lambda: _get_env("MILVUS_EMB_CACHE_DIR", ".emb_cache"))
 
     # 字段名设定，通常无需更改
     anns_field: str = "embedding"
@@ -70,18 +122,33 @@ class MilvusSettings:
     def index_params(self) -> Dict:
         """
         构建用于创建索引的参数字典
-        :return: 包含 metric_type, index_type, 以及 nlist 的参数字典
+        :return: 包含 metric_type, index_type, 以及索引构建参数（HNSW: M/efConstruction，IVF: nlist）的参数字典
         """
+        if self.index_type.startswith("HNSW"):
+            params = {"M": self.hnsw_m, "efConstruction": self.hnsw_ef_construction}
+        else:
+            params = {"nlist": self.index_nlist}
         return {
             "metric_type": self.metric_type,
             "index_type": self.index_type,
-            "params": {"nlist": self.index_nlist},
+            "params": params,
         }
 
     def search_params(self) -> Dict:
         """
         构建用于向量检索的参数字典
-        :return: 包含 metric_type 以及 nprobe 的参数字典
+        :return: 包含 metric_type 以及搜索参数（HNSW: ef，IVF: nprobe）的参数字典
+        """
+        if self.index_type.startswith("HNSW"):
+            params = {"ef": self.search_ef}
+        else:
+            params = {"nprobe": self.search_nprobe}
+        return {"metric_type": self.metric_type, "params": params}
+
+    def is_similarity_metric(self) -> bool:
+        """
+        度量值是否本身就是相似度（越大越相似）。
+        :return: IP / COSINE 返回 True，L2 等距离度量返回 False
         """
-        return {"metric_type": self.metric_type, "params": {"nprobe": self.search_nprobe}}
+        return self.metric_type.upper() in ("IP", "COSINE")
 
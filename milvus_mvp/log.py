@@ -1,16 +1,36 @@
+import functools
 import logging
 import os
 from typing import Optional
 
+# 根 logger 是否已由本模块配置过（basicConfig 每次调用都会获取 logging 模块锁，只需执行一次）
+_INITIALIZED = False
 
+
+def _init_logging():
+    """根据 LOG_LEVEL 环境变量配置日志格式和最低级别，整个进程只执行一次。"""
+    global _INITIALIZED
+    if _INITIALIZED:
+        return
+    # 获取日志级别（如 "INFO", "DEBUG" 等等，不区分大小写）
+    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+    # 已有 handler 时（如宿主程序先配置了 logging），basicConfig 会忽略重复设置
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+    )
+    _INITIALIZED = True
+
+
+@functools.lru_cache(maxsize=None)
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
     获取配置好的 logger 实例，根据 LOG_LEVEL 环境变量决定日志详细程度。
 
     主要流程：
-    1. 读取环境变量 LOG_LEVEL，决定日志输出级别，默认 INFO。
-    2. 配置日志输出格式和最低级别（只会全局生效一次）。
-    3. 返回指定名称的 logger，如果不传 name，则返回名为 "milvus_mvp" 的 logger。
+    1. 首次调用时读取环境变量 LOG_LEVEL（默认 INFO），配置日志输出格式和最低级别（只会全局生效一次）。
+    2. 返回指定名称的 logger，如果不传 name，则返回名为 "milvus_mvp" 的 logger。
+    3. 结果按名称缓存，各模块导入时重复调用直接命中缓存。
 
     Args:
         name (Optional[str]): logger的名称（通常为 __name__）
@@ -18,21 +38,7 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
     Returns:
         logging.Logger: 按需配置的 logger 实例
     """
-    # step1: 获取日志级别（如 "INFO", "DEBUG" 等等，不区分大小写）
-    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-
-    # step2: 配置日志格式，只会在第一次调用时真正生效
-    # （有 handler 时，basicConfig 会忽略重复设置）
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
-    )
-
-    # step3: 返回 logger 对象，默认名称 "milvus_mvp"（方便全局日志分组）
-    if name:
-        logger_name = name
-    else:
-        logger_name = "milvus_mvp"
-
-    return logging.getLogger(logger_name)
+    _init_logging()
 
+    # 返回 logger 对象，默认名称 "milvus_mvp"（方便全局日志分组）
+    return logging.getLogger(name or "milvus_mvp")
@@ -1,14 +1,22 @@
 """Service 层：封装常用业务流程（向量化 + CRUD + 搜索）。"""
 
-from .ingest import insert_texts, update_text, delete_by_ids, get_by_id, get_by_ids
-from .search import search_texts
+from .ingest import insert_texts, insert_texts_iter, stream_texts, update_text, delete_by_ids, get_by_id, get_by_ids
+from .search import search_texts, search_texts_async, search_texts_batch
+from .async_batcher import AsyncSearchBatcher
+from .encode_batcher import BatchedEncoder
 
 __all__ = [
     "insert_texts",
+    "insert_texts_iter",
+    "stream_texts",
     "update_text",
     "delete_by_ids",
     "get_by_id",
     "get_by_ids",
     "search_texts",
+    "search_texts_batch",
+    "search_texts_async",
+    "AsyncSearchBatcher",
+    "BatchedEncoder",
 ]
 
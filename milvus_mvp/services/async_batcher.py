@@ -0,0 +1,117 @@
+"""
+异步检索批处理（service）
+
+把短时间窗口内并发到达的单条检索请求合并为一次 MilvusClient.search_batch 调用：
+- 调用方 `await batcher.search(embedding, top_k)`，请求进入 asyncio.Queue 后等待结果
+- 后台任务取到第一条请求后最多再等待 linger_ms，把队列中的请求（最多 max_batch 条）合并成一批
+- 一批只发一次 RPC（limit 取批内最大的 top_k），结果按行拆回给各自的等待方
+- pymilvus 是同步 API，RPC 放到线程池执行；上一批在途时下一批可以继续攒，客户端与服务端的工作相互重叠
+"""
+
+import asyncio
+import functools
+from typing import List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from ..client import MilvusClient, SearchBatch
+from ..log import get_logger
+
+logger = get_logger(__name__)
+
+# 单批最多合并的请求数
+MAX_BATCH = 32
+# 收到第一条请求后等待更多请求的时间窗口（毫秒）
+LINGER_MS = 5
+
+_Request = Tuple[Union[List[float], np.ndarray], int, "asyncio.Future[SearchBatch]"]
+
+
+class AsyncSearchBatcher:
+    """
+    合并并发检索请求的异步批处理器。
+
+    用法：
+        batcher = AsyncSearchBatcher(client)
+        batch = await batcher.search(embedding, top_k=5)
+        ...
+        await batcher.close()
+    """
+
+    def __init__(self, client: MilvusClient, max_batch: int = MAX_BATCH, linger_ms: float = LINGER_MS):
+        self.client = client
+        self.max_batch = max_batch
+        self.linger = linger_ms / 1000.0
+        self._queue: Optional["asyncio.Queue[_Request]"] = None
+        self._worker: Optional["asyncio.Future[None]"] = None
+        self._inflight: Set["asyncio.Future[None]"] = set()
+
+    async def search(self, embedding: Union[List[float], np.ndarray], top_k: Optional[int] = None) -> SearchBatch:
+        """提交单条查询向量，等待所在批次完成后返回该条的 SearchBatch。"""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.ensure_future(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((embedding, top_k or self.client.settings.top_k_default, future))
+        return await future
+
+    async def close(self):
+        """停止后台任务并等待在途批次完成；尚未发出的请求以 CancelledError 结束。"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        while not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            future.cancel()
+        self._worker = None
+        self._queue = None
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            if self._queue.qsize() < self.max_batch - 1:
+                # 给并发请求留出时间窗口（asyncio.sleep 不会丢失队列中的元素）
+                try:
+                    await asyncio.sleep(self.linger)
+                except asyncio.CancelledError:
+                    # close() 发生在等待窗口内：已从队列取出、尚未发出的请求同样以 CancelledError 结束
+                    for _, _, future in batch:
+                        future.cancel()
+                    raise
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            task = asyncio.ensure_future(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[_Request]):
+        embeddings = [embedding for embedding, _, _ in batch]
+        limit = max(top_k for _, top_k, _ in batch)
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                None, functools.partial(self.client.search_batch, embeddings, top_k=limit)
+            )
+        except Exception as exc:
+            logger.error("批量检索失败（%d 条请求）: %s", len(batch), exc)
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        logger.debug("合并 %d 条检索请求为一次 RPC（limit=%d）", len(batch), limit)
+        for (_, top_k, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(_head(result, top_k))
+
+
+def _head(batch: SearchBatch, k: int) -> SearchBatch:
+    """截取前 k 条命中（批内 limit 取最大 top_k，各请求只返回自己要的条数）。"""
+    if len(batch) <= k:
+        return batch
+    return SearchBatch(ids=batch.ids[:k], distances=batch.distances[:k], scores=batch.scores[:k], texts=batch.texts[:k])
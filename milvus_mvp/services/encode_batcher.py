@@ -0,0 +1,111 @@
+"""
+向量化微批处理（service）
+
+把多个线程并发提交的单条文本合并为一次 TextVectorizer.encode 调用：
+- 调用方 `encoder.encode_async(text)` 立即拿到 concurrent.futures.Future，`encoder.encode(text)` 则阻塞等待结果
+- 后台线程取到第一条请求后最多再等待 linger_ms，把队列中的请求（最多 max_batch 条）合并成一批
+- 一批只做一次模型前向计算，模型的固定开销（分词、kernel 启动）按批摊薄，结果按行拆回给各自的 Future
+- 模型只在后台线程中调用，多线程服务下不会出现多个线程同时抢占模型的情况
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..log import get_logger
+from ..vectorizer import TextVectorizer
+
+logger = get_logger(__name__)
+
+# 单批最多合并的文本数
+EMBED_BATCH = 32
+# 收到第一条请求后等待更多请求的时间窗口（毫秒）
+EMBED_LINGER_MS = 2
+
+# 后台线程的停止标记
+_STOP = object()
+
+_Request = Tuple[str, "Future[np.ndarray]"]
+
+
+class BatchedEncoder:
+    """
+    合并并发向量化请求的微批处理器（线程版，可在 asyncio 中用 asyncio.wrap_future 等待）。
+
+    用法：
+        encoder = BatchedEncoder(vectorizer)
+        vec = encoder.encode("文本")
+        ...
+        encoder.close()
+    """
+
+    def __init__(self, vectorizer: TextVectorizer, max_batch: int = EMBED_BATCH, linger_ms: float = EMBED_LINGER_MS):
+        self.vectorizer = vectorizer
+        self.max_batch = max_batch
+        self.linger = linger_ms / 1000.0
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def encode_async(self, text: str) -> "Future[np.ndarray]":
+        """提交单条文本，返回 Future，完成后结果为该文本的 (dim,) 向量。"""
+        if self._worker is None:
+            with self._start_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="embed-batcher", daemon=True)
+                    self._worker.start()
+        future: "Future[np.ndarray]" = Future()
+        self._queue.put((text, future))
+        return future
+
+    def encode(self, text: str) -> np.ndarray:
+        """提交单条文本并等待所在批次完成。"""
+        return self.encode_async(text).result()
+
+    def close(self):
+        """处理完队列中已提交的请求后停止后台线程。"""
+        with self._start_lock:
+            worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        self._queue.put(_STOP)
+        worker.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch: List[_Request] = [item]
+            stop = False
+            deadline = time.monotonic() + self.linger
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch: List[_Request]):
+        texts = [text for text, _ in batch]
+        try:
+            vectors = self.vectorizer.encode(texts)
+        except Exception as exc:
+            logger.error("批量向量化失败（%d 条请求）: %s", len(batch), exc)
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        logger.debug("合并 %d 条向量化请求为一次前向计算", len(batch))
+        for (_, future), vector in zip(batch, vectors):
+            future.set_result(vector)
@@ -1,15 +1,76 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 from ..client import MilvusClient
 from ..vectorizer import TextVectorizer
 
 
-def insert_texts(client: MilvusClient, vectorizer: TextVectorizer, texts: List[str]) -> int:
+def insert_texts(
+    client: MilvusClient,
+    vectorizer: TextVectorizer,
+    texts: List[str],
+    ids: Optional[List[int]] = None,
+) -> int:
     embeddings = vectorizer.encode(texts)
-    client.insert_documents(texts, embeddings)
+    client.insert_documents(texts, embeddings, ids=ids)
     return len(texts)
 
 
+def insert_texts_iter(
+    client: MilvusClient,
+    vectorizer: TextVectorizer,
+    texts: Iterable[str],
+    batch_size: int = 1000,
+) -> int:
+    """
+    分批导入：每 batch_size 条向量化一次并插入一次，内存中最多只保留一批文本和向量。
+    """
+    return sum(client.insert_documents_iter(_encoded_pairs(vectorizer, texts, batch_size), batch_size=batch_size))
+
+
+def _encoded_pairs(vectorizer: TextVectorizer, texts: Iterable[str], batch_size: int):
+    batch: List[str] = []
+    for text in texts:
+        batch.append(text)
+        if len(batch) >= batch_size:
+            yield from zip(batch, vectorizer.encode(batch))
+            batch = []
+    if batch:
+        yield from zip(batch, vectorizer.encode(batch))
+
+
+def stream_texts(
+    client: MilvusClient,
+    vectorizer: TextVectorizer,
+    texts: Iterable[str],
+    encode_batch: int = 64,
+) -> int:
+    """
+    流式导入：按 encode_batch 分批向量化，逐条投递给后台写入线程。
+
+    向量化（CPU/GPU）与 Milvus 写入（网络 I/O）并行进行，适合大语料导入。
+    """
+    client.start_writer()
+    count = 0
+    batch: List[str] = []
+    try:
+        for text in texts:
+            batch.append(text)
+            if len(batch) >= encode_batch:
+                count += _stage_batch(client, vectorizer, batch)
+                batch = []
+        if batch:
+            count += _stage_batch(client, vectorizer, batch)
+    finally:
+        client.close_writer()
+    return count
+
+
+def _stage_batch(client: MilvusClient, vectorizer: TextVectorizer, batch: List[str]) -> int:
+    for text, embedding in zip(batch, vectorizer.encode(batch)):
+        client.stage(text, embedding)
+    return len(batch)
+
+
 def update_text(client: MilvusClient, vectorizer: TextVectorizer, doc_id: int, text: str):
     embedding = vectorizer.encode([text])[0]
     client.update_document(doc_id, text, embedding)
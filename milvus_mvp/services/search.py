@@ -5,26 +5,91 @@
 注意：此处不做任何业务过滤/排序，只负责最基础的 search，保持 MVP 范围最小。
 """
 
-from typing import List, Dict, Any
+import asyncio
+from typing import TYPE_CHECKING, List, Optional
 
-from ..client import MilvusClient
+import numpy as np
+
+from ..client import MilvusClient, SearchBatch
 from ..vectorizer import TextVectorizer
 
+if TYPE_CHECKING:
+    from .async_batcher import AsyncSearchBatcher
+    from .encode_batcher import BatchedEncoder
+
+# 多条查询的批量检索总命中数（len(queries) * top_k）达到该值时改为两阶段：
+# 先只取 id + distance，再对去重后的主键统一取回文本，多条查询命中同一文档时文本只传输一次
+# （单条查询的命中本身不重复，两阶段只会多一次 RPC，始终走单阶段）
+TWO_PHASE_MIN_HITS = 256
+
 
 def search_texts(
     client: MilvusClient,
     vectorizer: TextVectorizer,
     query: str,
     top_k: int,
-) -> List[Dict[str, Any]]:
+) -> SearchBatch:
     """
     文本搜索入口：
     1) 用 TextVectorizer 将 query 文本编码为向量
     2) 调用 MilvusClient.search 执行向量检索
 
     返回：
-        List[Dict]，每个 dict 含 id/text/distance/score
+        SearchBatch（ids/distances/scores/texts 列式结果）
     """
     query_embedding = vectorizer.encode([query])[0]
     return client.search(query_embedding, top_k=top_k)
 
+
+def search_texts_batch(
+    client: MilvusClient,
+    vectorizer: TextVectorizer,
+    queries: List[str],
+    top_k: int,
+) -> List[SearchBatch]:
+    """
+    批量文本搜索：
+    1) 一次性将所有 queries 编码为向量（单次前向计算，摊薄模型调用开销）
+    2) 调用 MilvusClient.search_batch，所有查询在一次 RPC 中检索
+    3) 多条查询且总命中数达到 TWO_PHASE_MIN_HITS 时，检索不带文本，再只对实际命中的去重主键 hydrate 一次
+
+    返回：
+        List[SearchBatch]，与 queries 一一对应
+    """
+    if not queries:
+        return []
+    query_embeddings = vectorizer.encode(queries)
+    if len(queries) <= 1 or len(queries) * top_k < TWO_PHASE_MIN_HITS:
+        return client.search_batch(query_embeddings, top_k=top_k)
+
+    batches = client.search_batch(query_embeddings, top_k=top_k, fetch_text=False)
+    # 只为实际返回的命中取文本：各查询返回的主键合并去重（命中不足 top_k 时自然更少），没有命中时不发 RPC
+    hit_ids = np.unique(np.concatenate([batch.ids for batch in batches]))
+    texts = client.hydrate(hit_ids.tolist()) if hit_ids.size else {}
+    for batch in batches:
+        batch.texts = [texts.get(doc_id) for doc_id in batch.ids.tolist()]
+    return batches
+
+
+async def search_texts_async(
+    batcher: "AsyncSearchBatcher",
+    vectorizer: TextVectorizer,
+    query: str,
+    top_k: int,
+    encoder: Optional["BatchedEncoder"] = None,
+) -> SearchBatch:
+    """
+    异步文本搜索：
+    1) 将 query 编码为向量（不阻塞事件循环）：传入 encoder 时与其他并发请求合并为一次前向计算，
+       否则在线程池中单独编码
+    2) 交给 AsyncSearchBatcher，与同一时间窗口内的其他请求合并为一次 RPC
+
+    返回：
+        SearchBatch（ids/distances/scores/texts 列式结果）
+    """
+    if encoder is not None:
+        query_embedding = await asyncio.wrap_future(encoder.encode_async(query))
+    else:
+        loop = asyncio.get_running_loop()
+        query_embedding = (await loop.run_in_executor(None, vectorizer.encode, [query]))[0]
+    return await batcher.search(query_embedding, top_k=top_k)
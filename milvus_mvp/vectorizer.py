@@ -3,38 +3,273 @@
 使用 sentence-transformers 将文本转换为向量
 """
 
-from typing import List
-from sentence_transformers import SentenceTransformer
+import functools
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+import numpy as np
 
 from .log import get_logger
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
 logger = get_logger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _normalize_kernel() -> Optional[Callable[[np.ndarray], np.ndarray]]:
+    """
+    首次归一化时才导入 numba 并编译逐行归一化内核，未安装 numba 时返回 None。
+
+    numba 导入约需上百毫秒，放在模块顶层会拖慢 delete / get 等根本不做向量化的 CLI 子命令。
+    """
+    try:  # numba 为可选依赖，未安装时回退到 NumPy 实现
+        from numba import njit
+    except ImportError:  # pragma: no cover - 取决于运行环境
+        return None
+
+    # 不开启 parallel：numba 的并行线程池在非主线程（BatchedEncoder / 线程池中的 encode）中启动后
+    # 会导致解释器退出时挂起；单批最多几千行，串行融合循环已远快于模型前向计算
+    @njit(fastmath=True, cache=True)
+    def _normalize_2d(x):
+        """逐行原地 L2 归一化：平方和、开方、相除融合在一次循环中，不产生临时数组。"""
+        n, d = x.shape
+        for i in range(n):
+            s = 0.0
+            for j in range(d):
+                s += x[i, j] * x[i, j]
+            inv = 1.0 / (np.sqrt(s) + 1e-12)
+            for j in range(d):
+                x[i, j] *= inv
+        return x
+
+    return _normalize_2d
+
+
+def normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """
+    对 (N, dim) 向量矩阵做逐行 L2 归一化，返回 C 连续的 float32 数组。
+
+    - 安装了 numba 时使用 JIT 编译的内核（首次调用时按需导入并编译，原地修改，调用前确保可写）
+    - 否则回退到 NumPy 向量化实现
+    """
+    embeddings = np.require(embeddings, dtype=np.float32, requirements=["C", "W"])
+    kernel = _normalize_kernel()
+    if kernel is not None:
+        return kernel(embeddings)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings /= norms + 1e-12
+    return embeddings
+
+
+class EmbeddingCache:
+    """
+    基于 SQLite 的向量持久化缓存。
+
+    - key：sha256(model_name + "\\0" + text)，不同模型的向量互不干扰
+    - value：float32 向量的原始字节（ndarray.tobytes()）
+    - 每个模型一个库文件：{cache_dir}/{model_name}.db
+    """
+
+    def __init__(self, cache_dir: str, model_name: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        safe_name = model_name.replace("/", "_")
+        self.path = os.path.join(cache_dir, f"{safe_name}.db")
+        self.model_name = model_name
+        # 连接可能在创建线程之外使用（由 TextVectorizer 的锁保证同一时刻只有一个线程访问）
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)")
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """批量读取，返回命中的 key -> 向量。"""
+        found: Dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(keys))
+        # SQLite 单条语句的参数个数有限制，分批查询
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})", chunk
+            )
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        """批量写入（已存在则覆盖）。"""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                [(key, np.asarray(vec, dtype=np.float32).tobytes()) for key, vec in items.items()],
+            )
+
+    def close(self):
+        self._conn.close()
+
+
 class TextVectorizer:
-    """文本向量化器"""
+    """
+    文本向量化器
+
+    模型在首次真正需要时（encode 缓存未命中 / 查询维度）才加载，构造本身不产生模型加载开销。
+    encode 线程安全：缓存读写与模型调用由实例锁串行化；多线程并发的单条请求可经
+    services.BatchedEncoder 合并成批，避免逐条排队前向计算。
+    """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_dir: Optional[str] = None,
+        normalize: bool = True,
+        batch_size: int = 64,
+        memory_cache_size: int = 1024,
+    ):
         """
         Args:
             model_name: sentence-transformers 模型名称
                 - all-MiniLM-L6-v2: 快速，384维
                 - all-mpnet-base-v2: 更准确，768维
+            cache_dir: 向量缓存目录，为空时不启用缓存
+            normalize: 是否对输出向量做 L2 归一化（配合 IP 度量时内积即余弦相似度）
+            batch_size: 模型前向计算的批大小。sentence-transformers 会先按文本长度排序再分批
+                （smart batching），长度相近的文本同批，减少 padding 浪费的计算
+            memory_cache_size: 进程内 LRU 向量缓存的条数（位于磁盘缓存之前），为 0 时不启用
+        """
+        self.model_name = model_name
+        self.normalize = normalize
+        self.batch_size = batch_size
+        self._model: Optional["SentenceTransformer"] = None
+        self._dimension: Optional[int] = None
+        # 归一化与否得到的向量不同，缓存按不同命名空间隔离
+        cache_name = f"{model_name}-normalized" if normalize else model_name
+        self.cache = EmbeddingCache(cache_dir, cache_name) if cache_dir else None
+        # 进程内 LRU 缓存（文本 -> 向量），同一进程内重复出现的文本连 SQLite 都不用查
+        self.memory_cache_size = memory_cache_size
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # 保护模型加载、两级缓存与模型调用（OrderedDict / sqlite 连接都不是线程安全的）
+        self._lock = threading.RLock()
+
+    @property
+    def model(self) -> "SentenceTransformer":
+        """首次访问时加载 SentenceTransformer 模型（sentence-transformers/torch 也在此时才导入）"""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+
+                    logger.info("加载向量化模型: %s", self.model_name)
+                    self._model = SentenceTransformer(self.model_name)
+                    logger.info("模型加载完成，向量维度: %s", self.dimension)
+        return self._model
+
+    @property
+    def dimension(self) -> int:
+        if self._dimension is None:
+            self._dimension = self.model.get_sentence_embedding_dimension()
+        return self._dimension
+
+    def encode(self, texts: List[str]) -> np.ndarray:
         """
-        logger.info("加载向量化模型: %s", model_name)
-        self.model = SentenceTransformer(model_name)
-        self.dimension = self.model.get_sentence_embedding_dimension()
-        logger.info("模型加载完成，向量维度: %s", self.dimension)
+        将文本列表转换为 (N, dim) 的 C 连续 float32 数组（启用缓存时先查内存 LRU，再查磁盘缓存）。
 
-    def encode(self, texts: List[str]) -> List[List[float]]:
-        """将文本列表转换为向量列表"""
+        不做 tolist()，省去 N*dim 个 Python float 对象的分配；MilvusClient 的插入/检索接口可直接接收，
+        PyMilvus 按缓冲区整块序列化。需要 Python 列表时调用方自行 .tolist()。
+        """
         if isinstance(texts, str):
             texts = [texts]
+        if not texts:
+            return np.empty((0, self._dimension or 0), dtype=np.float32)
 
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
-        return embeddings.tolist()
+        with self._lock:
+            if self.cache is not None or self.memory_cache_size > 0:
+                return _cached_encode_array(self, texts)
+            return self._encode(texts)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """直接调用模型编码（按长度排序分批），返回 float32 数组"""
+        embeddings = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        )
+        if self.normalize:
+            return normalize_rows(embeddings)
+        return embeddings.astype(np.float32, copy=False)
 
     def get_dimension(self) -> int:
         """获取向量维度"""
         return self.dimension
 
+    def _memory_get(self, text: str) -> Optional[np.ndarray]:
+        vec = self._memory.get(text)
+        if vec is not None:
+            self._memory.move_to_end(text)
+        return vec
+
+    def _memory_put(self, text: str, vec: np.ndarray):
+        if self.memory_cache_size <= 0:
+            return
+        # 存副本：vec 通常是整批编码结果的行视图，直接缓存会让一条存活的条目拖住整个 (N, dim) 数组
+        self._memory[text] = vec.copy()
+        self._memory.move_to_end(text)
+        while len(self._memory) > self.memory_cache_size:
+            self._memory.popitem(last=False)
+
+
+def _cached_encode_array(vectorizer: TextVectorizer, texts: List[str]) -> np.ndarray:
+    """
+    带两级缓存的向量化：
+
+    1) 先查进程内 LRU（文本 -> 向量）
+    2) 未命中的文本逐条计算 sha256 key，批量查磁盘缓存（启用时）
+    3) 仍未命中的文本合并为一次 vectorizer 调用，结果写回两级缓存，按原顺序拼装为 float32 数组
+    """
+    cache = vectorizer.cache
+    # 同一批次内的重复文本只处理一次
+    unique = list(dict.fromkeys(texts))
+    vecs: Dict[str, np.ndarray] = {}
+    missing: List[str] = []
+    for text in unique:
+        vec = vectorizer._memory_get(text)
+        if vec is None:
+            missing.append(text)
+        else:
+            vecs[text] = vec
+    memory_hits = len(vecs)
+
+    if missing and cache is not None:
+        keys = {text: cache.key(text) for text in missing}
+        hits = cache.get_many(list(keys.values()))
+        for text in missing:
+            if keys[text] in hits:
+                vecs[text] = hits[keys[text]]
+                vectorizer._memory_put(text, vecs[text])
+        missing = [text for text in missing if text not in vecs]
+
+    if missing:
+        fresh = dict(zip(missing, vectorizer._encode(missing)))
+        if cache is not None:
+            cache.put_many({cache.key(text): vec for text, vec in fresh.items()})
+        # 超过 LRU 容量的批次（如批量导入）只缓存末尾的 memory_cache_size 条，前面的写入后也会被立即淘汰
+        if vectorizer.memory_cache_size > 0:
+            for text in missing[-vectorizer.memory_cache_size:]:
+                vectorizer._memory_put(text, fresh[text])
+        vecs.update(fresh)
+    logger.debug(
+        "向量缓存命中：内存 %d，磁盘 %d，新编码 %d（共 %d 条不同文本）",
+        memory_hits,
+        len(unique) - memory_hits - len(missing),
+        len(missing),
+        len(unique),
+    )
+
+    return np.stack([vecs[text] for text in texts])
@@ -2,10 +2,14 @@
 向量化模块
 使用sentence-transformers将文本转换为向量
 """
+import logging
+
 from sentence_transformers import SentenceTransformer
 from typing import List
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 
 class TextVectorizer:
     """文本向量化器"""
@@ -19,27 +23,27 @@ class TextVectorizer:
                 - all-MiniLM-L6-v2: 快速，384维
                 - all-mpnet-base-v2: 更准确，768维
         """
-        print(f"正在加载模型: {model_name}...")
+        logger.info("正在加载模型: %s...", model_name)
         self.model = SentenceTransformer(model_name)
         self.dimension = self.model.get_sentence_embedding_dimension()
-        print(f"✓ 模型加载完成，向量维度: {self.dimension}")
+        logger.info("模型加载完成，向量维度: %s", self.dimension)
     
-    def encode(self, texts: List[str]) -> List[List[float]]:
+    def encode(self, texts: List[str]) -> np.ndarray:
         """
-        将文本列表转换为向量（嵌入）列表
+        将文本列表转换为向量（嵌入）矩阵
 
         Args:
             texts: 需要进行向量化的文本列表（List[str]）。
                    也支持直接传入单个字符串，将自动转换为列表处理。
 
         Returns:
-            List[List[float]]: 每个输入文本对应的向量（以浮点数列表表示）。
+            np.ndarray: (N, dim) 的 C 连续 float32 数组，每行对应一个输入文本。
         
         详细流程说明:
         1. 兼容参数类型。如果输入为单个字符串，封装成单元素列表，实现统一处理。
         2. 使用SentenceTransformer模型进行向量化（self.model.encode）。
            - convert_to_numpy=True: 输出为numpy array，便于后续数值计算和高效存储。
-        3. 将numpy array通过tolist()方法转为普通Python列表，便于序列化或与数据库/框架交互。
+        3. 直接返回连续的 float32 数组（不做 tolist()），PyMilvus 可整块序列化，省去逐个 Python float 的分配与转换。
         """
         # 如果传入的是单个字符串，封装为单元素列表以统一处理
         if isinstance(texts, str):
@@ -48,8 +52,8 @@ class TextVectorizer:
         # 使用句子Transformer模型编码，得到文本的嵌入表示（NumPy数组格式）
         embeddings = self.model.encode(texts, convert_to_numpy=True)
         
-        # 将NumPy数组转换为普通Python列表（List[List[float]]），以便兼容性和易于存储
-        return embeddings.tolist()
+        # 保持 float32 连续数组，插入/检索时直接交给 PyMilvus
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
     
     def get_dimension(self) -> int:
         """获取向量维度"""